@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark MMseqs RBH result loading for conserved CDS tracks (Typed vs Legacy)
+
+Synthetic panel of query RBH results against one reference genome is generated.
+
+Usage:
+    python benchmarks/bench_rbh_loader.py [-q 100] [-c 5000] [-r 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mgcplotter.circos_config import load_rbh_cds_identities, pa_csv, rbh_columns
+
+
+def write_rbh_result_files(
+    outdir: Path, query_num: int, cds_num: int, seed: int = 0
+) -> Tuple[List[Path], np.ndarray, np.ndarray, np.ndarray]:
+    """Write synthetic MMseqs RBH result files"""
+    rng = np.random.default_rng(seed)
+    starts = np.sort(rng.integers(0, cds_num * 1000, cds_num))
+    ends = starts + rng.integers(100, 3000, cds_num)
+    strands = rng.choice(np.array(["+", "-"]), cds_num)
+    rbh_result_files = []
+    for query_idx in range(query_num):
+        cds_idxs = rng.permutation(cds_num)[: int(cds_num * rng.uniform(0.3, 0.9))]
+        lines = []
+        for i in cds_idxs.tolist():
+            target = f"GENE{i + 1:06d}_WP_{i:09d}.1|{starts[i]}_{ends[i]}_{strands[i]}|"
+            fident = rng.integers(200, 1001) / 1000
+            lines.append(
+                f"Q{query_idx}_{i}\t{target}\t{fident:.3f}\t300\t10\t1\t1\t300\t1\t300"
+                + "\t1.000E-50\t500\n"
+            )
+        rbh_result_file = outdir / f"query{query_idx:03d}_vs_reference_rbh.tsv"
+        rbh_result_file.write_text("".join(lines))
+        rbh_result_files.append(rbh_result_file)
+    return rbh_result_files, starts, ends, strands
+
+
+def legacy_load(rbh_result_file: Path) -> Tuple[List[List[str]], pd.Series]:
+    """Previous loader (All columns & String sort & Row by row TARGET split)"""
+    df = pd.read_table(rbh_result_file, header=None, names=rbh_columns)
+    df = df.drop_duplicates(subset="TARGET").sort_values("TARGET")
+    locations = [str(target).split("|")[1].split("_") for target in df["TARGET"]]
+    return locations, df["FIDENT"]
+
+
+def typed_load(
+    rbh_result_file: Path, starts: np.ndarray, ends: np.ndarray, strands: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Typed loader (TARGET & FIDENT only) & CDS index lookup"""
+    cds_idxs, fidents = load_rbh_cds_identities(rbh_result_file)
+    return starts[cds_idxs], ends[cds_idxs], strands[cds_idxs], fidents
+
+
+def check_same_result(
+    rbh_result_file: Path, starts: np.ndarray, ends: np.ndarray, strands: np.ndarray
+) -> None:
+    """Check legacy & typed loader results are same"""
+    locations, fidents = legacy_load(rbh_result_file)
+    typed_result = typed_load(rbh_result_file, starts, ends, strands)
+    typed_locations = [[str(v) for v in loc] for loc in zip(*typed_result[0:3])]
+    assert locations == typed_locations
+    assert fidents.tolist() == typed_result[3].tolist()
+
+
+def measure(func, repeat: int) -> float:
+    """Measure best elapsed time of function"""
+    elapsed_times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        elapsed_times.append(time.perf_counter() - start_time)
+    return min(elapsed_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-q", type=int, default=100, help="Number of queries")
+    parser.add_argument("-c", type=int, default=5000, help="Number of reference CDSs")
+    parser.add_argument("-r", type=int, default=3, help="Repeat count")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files, starts, ends, strands = write_rbh_result_files(
+            Path(tmpdir), args.q, args.c
+        )
+        for file in files:
+            check_same_result(file, starts, ends, strands)
+
+        legacy_time = measure(lambda: [legacy_load(f) for f in files], args.r)
+        typed_time = measure(
+            lambda: [typed_load(f, starts, ends, strands) for f in files], args.r
+        )
+    reader = "pyarrow" if pa_csv is not None else "pandas(c)"
+    print(f"queries={args.q}, reference CDSs={args.c}, typed reader={reader}")
+    print(f"legacy[s]={legacy_time:.3f} typed[s]={typed_time:.3f} ", end="")
+    print(f"speedup={legacy_time / typed_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
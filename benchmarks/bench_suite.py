@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Benchmark suite of MGCplotter in-process stages on synthetic genomes
+
+Each case is `{genome size}:{contig number}:{query number}` (e.g. `5Mb:100:50`).
+Reference GenBank, query RBH results & COGclassifier result are generated by
+seeded synthetic generator (benchmarks/synthetic.py), then each stage is run in
+isolation and profiled (wall time, CPU time, peak RSS, tracemalloc peak).
+Each case is run in a fresh process, and peak RSS & RSS delta are measured
+per stage (Not process high-water mark), so memory usage of earlier stages &
+cases is not attributed to later stages.
+Results are written as JSON to compare across commits.
+
+Usage:
+    python benchmarks/bench_suite.py [-c 1Mb:1:1 ...] [-p small|full] [-o out.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from Bio import SeqIO
+from synthetic import generate_cog_result, generate_genbank, generate_rbh_result
+
+from mgcplotter import config
+from mgcplotter.circos_config import CircosConfig, load_rbh_cds_identities
+from mgcplotter.circos_legend import CircosLegend
+from mgcplotter.genbank import Genbank
+from mgcplotter.mgcplotter import get_cds_colors
+from mgcplotter.profiler import StageProfiler
+
+presets = {
+    "small": ["1Mb:1:1", "1Mb:100:10"],
+    "full": [
+        "1Mb:1:1",
+        "5Mb:1:50",
+        "15Mb:1:100",
+        "10Mb:10000:10",
+        "5Mb:100:500",
+    ],
+}
+size_units = {"kb": 10**3, "mb": 10**6}
+
+
+def parse_case(case: str) -> Tuple[int, int, int]:
+    """Parse case string (e.g. '5Mb:100:50' -> (5000000, 100, 50))"""
+    size, contig_num, query_num = case.split(":")
+    size = size.lower()
+    unit = size_units.get(size[-2:], 1)
+    if size[-2:] in size_units:
+        size = size[:-2]
+    return int(float(size) * unit), int(contig_num), int(query_num)
+
+
+def generate_case_data(
+    outdir: Path, genome_size: int, contig_num: int, query_num: int, seed: int
+) -> Tuple[Path, Path, List[Path], Path]:
+    """Generate synthetic reference GenBank, RBH results & COGclassifier result"""
+    gbk_file = outdir / "reference.gbk"
+    generate_genbank(gbk_file, genome_size, contig_num, seed=seed)
+    faa_file = outdir / "reference_cds.faa"
+    Genbank(gbk_file, fast_parser=True).write_cds_fasta(faa_file)
+    ref_cds_ids = [rec.id for rec in SeqIO.parse(faa_file, "fasta")]
+    rbh_result_files = []
+    for query_idx in range(1, query_num + 1):
+        rbh_result_file = outdir / f"query{query_idx:03d}_vs_reference_rbh.tsv"
+        generate_rbh_result(
+            rbh_result_file,
+            ref_cds_ids,
+            query_name=f"query{query_idx:03d}",
+            hit_ratio=0.3 + 0.6 * query_idx / query_num,
+            seed=seed + query_idx,
+        )
+        rbh_result_files.append(rbh_result_file)
+    cog_result_file = outdir / "classifier_result.tsv"
+    generate_cog_result(cog_result_file, ref_cds_ids, seed=seed)
+    return gbk_file, faa_file, rbh_result_files, cog_result_file
+
+
+def run_case(
+    case: str, workdir: Path, seed: int = 0, detail: bool = False
+) -> Dict[str, Any]:
+    """Run all stages of case in isolation (Called in fresh process)"""
+    profiler = StageProfiler(
+        workdir / "profile" / case.replace(":", "_"), detail=detail
+    )
+    genome_size, contig_num, query_num = parse_case(case)
+    outdir = workdir / case.replace(":", "_")
+    outdir.mkdir(parents=True)
+
+    start_time = time.perf_counter()
+    gbk_file, faa_file, rbh_result_files, cog_result_file = generate_case_data(
+        outdir, genome_size, contig_num, query_num, seed
+    )
+    generate_time = time.perf_counter() - start_time
+
+    with profiler.stage("genbank_parse"):
+        ref_gbk = Genbank(gbk_file, fast_parser=True)
+    with profiler.stage("cds_fasta"):
+        ref_gbk.write_cds_fasta(faa_file)
+    cds_num = len(ref_gbk.feature_table.search("CDS"))
+
+    with profiler.stage("gc_content_skew"):
+        ref_gbk.clear_cache()
+        circos_config = CircosConfig(ref_gbk, outdir / "circos")
+        window_size, step_size = circos_config._window_size, circos_config._step_size
+        ref_gbk.gc_content(window_size, step_size)
+        ref_gbk.gc_skew(window_size, step_size)
+
+    with profiler.stage("rbh_load"):
+        for rbh_result_file in rbh_result_files:
+            load_rbh_cds_identities(rbh_result_file)
+
+    with profiler.stage("cog_colors"):
+        cds_colors = get_cds_colors(cog_result_file, config.cog_letter2color, cds_num)
+
+    with profiler.stage("circos_config"):
+        ref_gbk.clear_cache()
+        circos_config = CircosConfig(ref_gbk, outdir / "circos", cds_colors=cds_colors)
+        for rbh_result_file in rbh_result_files:
+            circos_config.add_conserved_cds_config(rbh_result_file)
+        circos_config.write_config_file()
+
+    with profiler.stage("circos_legend"):
+        CircosLegend(
+            circos_config,
+            config.cog_letter2color,
+            config.cog_letter2desc,
+            outdir / "circos_legend",
+        ).plot_all_legends(processes=1)
+
+    profiler.write_report()
+
+    return dict(
+        case=case,
+        genome_size=genome_size,
+        contig_num=contig_num,
+        query_num=query_num,
+        cds_num=cds_num,
+        generate_time=round(generate_time, 6),
+        stages=[asdict(r) for r in profiler.records],
+    )
+
+
+def git_commit() -> Optional[str]:
+    """Current git commit hash of repository (None if unavailable)"""
+    try:
+        cmd = ["git", "rev-parse", "--short", "HEAD"]
+        cwd = Path(__file__).parent
+        return subprocess.check_output(cmd, cwd=cwd, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "-c",
+        "--cases",
+        nargs="+",
+        default=None,
+        help="Cases '{genome size}:{contig number}:{query number}' (e.g. 5Mb:100:50)",
+    )
+    parser.add_argument(
+        "-p",
+        "--preset",
+        choices=list(presets),
+        default="small",
+        help="Preset cases (Ignored if --cases is set) (Default: small)",
+    )
+    parser.add_argument(
+        "-o",
+        "--outfile",
+        type=Path,
+        default=None,
+        help="Output result JSON file (Default: print to stdout)",
+    )
+    parser.add_argument(
+        "-s", "--seed", type=int, default=0, help="Random seed (Default: 0)"
+    )
+    parser.add_argument(
+        "--detail",
+        action="store_true",
+        help="Record tracemalloc peak & dump cProfile stats of each stage",
+    )
+    parser.add_argument(
+        "--keep",
+        type=Path,
+        default=None,
+        help="Keep generated data & outputs in this directory",
+    )
+    args = parser.parse_args()
+    cases = presets[args.preset] if args.cases is None else args.cases
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir) if args.keep is None else args.keep
+        mp_context = multiprocessing.get_context("spawn")
+        case_results = []
+        for case in cases:
+            with ProcessPoolExecutor(1, mp_context=mp_context) as executor:
+                future = executor.submit(
+                    run_case, case, workdir, args.seed, args.detail
+                )
+                case_result = future.result()
+            case_results.append(case_result)
+            print(f"# {case} (CDS={case_result['cds_num']})", file=sys.stderr)
+            for r in case_result["stages"]:
+                print(
+                    f"{r['name']:<16} {r['wall_time']:>9.3f}s"
+                    + f" (Peak RSS {r['peak_rss_mb']:.1f}MB,"
+                    + f" RSS delta {r['rss_delta_mb']:+.1f}MB)",
+                    file=sys.stderr,
+                )
+
+    result = dict(
+        commit=git_commit(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        seed=args.seed,
+        detail=args.detail,
+        cases=case_results,
+    )
+    if args.outfile is None:
+        print(json.dumps(result, indent=2))
+    else:
+        args.outfile.write_text(json.dumps(result, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Benchmark Circos track data file writer (Bulk writer vs Per line concatenation)
+
+Cases: CDS feature track, GC histogram track, COG colored CDS track
+(write & rewrite vs direct write)
+
+Usage:
+    python benchmarks/bench_track_writer.py [-n 1000000] [-r 3]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import matplotlib as mpl
+import numpy as np
+
+from mgcplotter import config
+from mgcplotter.circos_config import write_track_file
+
+
+def legacy_write_feature_file(file: Path, starts, ends, strands, color: str) -> None:
+    """Previous per line string concatenation writer"""
+    contents = ""
+    for start, end, strand in zip(starts.tolist(), ends.tolist(), strands.tolist()):
+        strand = "+" if strand == 1 else "-"
+        contents += f"main {start} {end} {strand} color={color}\n"
+    with open(file, "w") as f:
+        f.write(contents)
+
+
+def bulk_write_feature_file(file: Path, starts, ends, strands, color: str) -> None:
+    """Bulk writer"""
+    write_track_file(
+        file, starts, ends, np.where(strands == 1, "+", "-"), f"color={color}"
+    )
+
+
+def legacy_write_histogram_file(file: Path, values: List[float], step: int) -> None:
+    """Previous per line string concatenation writer"""
+    contents = ""
+    for i, value in enumerate(values):
+        start = i * step
+        end = start + step
+        color = "black" if value > 0 else "grey"
+        contents += f"main {start} {end} {value} fill_color={color}\n"
+    with open(file, "w") as f:
+        f.write(contents)
+
+
+def bulk_write_histogram_file(file: Path, values: List[float], step: int) -> None:
+    """Bulk writer"""
+    array = np.array(values)
+    starts = np.arange(len(array), dtype=np.int64) * step
+    colors = np.where(array > 0, "fill_color=black", "fill_color=grey")
+    write_track_file(file, starts, starts + step, values, colors)
+
+
+def legacy_rewrite_circos_cds_color(
+    circos_cds_file: Path, location_id2color: Dict[str, str]
+) -> None:
+    """Previous per line COG color rewriter"""
+    contents = ""
+    with open(circos_cds_file) as f:
+        for line in f.read().splitlines():
+            location_id = " ".join(line.split(" ")[1:4])
+            color = location_id2color.get(location_id, config.cog_letter2color["-"])
+            hexcolor = mpl.colors.to_hex(color).lstrip("#")
+            contents += " ".join(line.split(" ")[0:4]) + f" color={hexcolor}\n"
+    with open(circos_cds_file, "w") as f:
+        f.write(contents)
+
+
+def bulk_write_cog_feature_file(
+    file: Path, starts, ends, strands, cds_colors: np.ndarray
+) -> None:
+    """Bulk writer with COG colors of CDS indices assigned up front (as CircosConfig)"""
+    strands = np.where(strands == 1, "+", "-")
+    colors = cds_colors.tolist()
+    color2option = {c: f"color={mpl.colors.to_hex(c).lstrip('#')}" for c in set(colors)}
+    options = [color2option[c] for c in colors]
+    write_track_file(file, starts, ends, strands, options)
+
+
+def measure(func: Callable[[], None], repeat: int) -> float:
+    """Measure best elapsed time of function"""
+    elapsed_times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        elapsed_times.append(time.perf_counter() - start_time)
+    return min(elapsed_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", type=int, default=1000000, help="Max number of lines")
+    parser.add_argument("-r", type=int, default=3, help="Repeat count")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'track':<10} {'lines':>9} {'legacy[s]':>10} {'bulk[s]':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy_file, bulk_file = Path(tmpdir) / "legacy.txt", Path(tmpdir) / "bulk.txt"
+        for n in sorted({args.n // 10, args.n}):
+            starts = np.sort(rng.integers(0, n * 1000, n))
+            ends = starts + rng.integers(100, 3000, n)
+            strands = rng.choice(np.array([1, -1], dtype=np.int8), n)
+            values = (rng.random(n) - 0.5).tolist()
+            cog_colors = list(config.cog_letter2color.values())
+            location_id2color = {
+                f"{s} {e} {'+' if st == 1 else '-'}": cog_colors[i % len(cog_colors)]
+                for i, (s, e, st) in enumerate(zip(starts, ends, strands))
+                if i % 4 != 0
+            }
+            cds_colors = np.full(n, config.cog_letter2color["-"], dtype=object)
+            for i in range(n):
+                if i % 4 != 0:
+                    cds_colors[i] = cog_colors[i % len(cog_colors)]
+
+            def write_and_rewrite(file: Path) -> None:
+                legacy_write_feature_file(file, starts, ends, strands, "red")
+                legacy_rewrite_circos_cds_color(file, location_id2color)
+
+            cases = [
+                (
+                    "feature",
+                    lambda f: legacy_write_feature_file(
+                        f, starts, ends, strands, "red"
+                    ),
+                    lambda f: bulk_write_feature_file(f, starts, ends, strands, "red"),
+                ),
+                (
+                    "histogram",
+                    lambda f: legacy_write_histogram_file(f, values, 400),
+                    lambda f: bulk_write_histogram_file(f, values, 400),
+                ),
+                (
+                    "cog_color",
+                    write_and_rewrite,
+                    lambda f: bulk_write_cog_feature_file(
+                        f, starts, ends, strands, cds_colors
+                    ),
+                ),
+            ]
+            for name, legacy_func, bulk_func in cases:
+                legacy_time = measure(lambda: legacy_func(legacy_file), args.r)
+                bulk_time = measure(lambda: bulk_func(bulk_file), args.r)
+                assert legacy_file.read_bytes() == bulk_file.read_bytes()
+                speedup = legacy_time / bulk_time
+                print(
+                    f"{name:<10} {n:>9} {legacy_time:>10.3f} "
+                    + f"{bulk_time:>8.3f} {speedup:>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Seeded synthetic data generator for benchmarks
+
+Generates reference GenBank file, MMseqs RBH result TSV files (Query vs Reference
+CDS fasta written by `Genbank.write_cds_fasta`) and COGclassifier result TSV file.
+Same parameters & seed always generate same files.
+"""
+
+import textwrap
+from pathlib import Path
+from typing import Sequence, Union
+
+import numpy as np
+
+from mgcplotter import config
+
+amino_acids = np.array(list("ACDEFGHIKLMNPQRSTVWY"))
+bases = np.frombuffer(b"ACGT", dtype=np.uint8)
+
+
+def generate_genbank(
+    outfile: Union[str, Path],
+    genome_size: int,
+    contig_num: int = 1,
+    seed: int = 0,
+    gene_interval: int = 1000,
+) -> None:
+    """Generate synthetic GenBank file
+
+    Genome is split into `contig_num` contigs of (almost) equal size.
+    CDS (with translation) are placed about every `gene_interval` bases on
+    random strand, and every 50th feature is rRNA or tRNA.
+
+    Args:
+        outfile (Union[str, Path]): Output GenBank file
+        genome_size (int): Total genome size
+        contig_num (int, optional): Number of contigs
+        seed (int, optional): Random seed
+        gene_interval (int, optional): Mean interval of genes
+    """
+    rng = np.random.default_rng(seed)
+    contig_sizes = np.full(contig_num, genome_size // contig_num)
+    contig_sizes[: genome_size % contig_num] += 1
+    feature_idx = 0
+    with open(outfile, "w") as f:
+        for contig_idx, contig_size in enumerate(contig_sizes.tolist(), 1):
+            seq = bases[rng.integers(0, 4, contig_size)].tobytes().decode()
+            name = f"contig{contig_idx:05d}"
+            f.write(
+                f"LOCUS       {name:<16}{contig_size:>12} bp    DNA     linear   "
+                + "BCT 01-JAN-2000\n"
+                + f"DEFINITION  Synthetic genome {name}.\n"
+                + f"ACCESSION   {name}\n"
+                + "FEATURES             Location/Qualifiers\n"
+                + f"     source          1..{contig_size}\n"
+            )
+            pos = int(rng.integers(0, gene_interval // 2))
+            while True:
+                length = int(rng.integers(100, 600)) * 3
+                if pos + length > contig_size:
+                    break
+                start, end = pos + 1, pos + length
+                location = f"{start}..{end}"
+                if rng.random() < 0.5:
+                    location = f"complement({location})"
+                feature_idx += 1
+                f.write(_feature_lines(rng, feature_idx, location, length))
+                pos = end + int(rng.integers(1, gene_interval))
+            f.write("ORIGIN\n")
+            for i in range(0, contig_size, 60):
+                chunks = [
+                    seq[j : j + 10].lower()
+                    for j in range(i, min(i + 60, contig_size), 10)
+                ]
+                f.write(f"{i + 1:>9} {' '.join(chunks)}\n")
+            f.write("//\n")
+
+
+def _feature_lines(
+    rng: np.random.Generator, feature_idx: int, location: str, length: int
+) -> str:
+    """Synthetic feature (CDS, rRNA, tRNA) lines"""
+    spacer = " " * 21
+    if feature_idx % 50 == 0:
+        feature_type = "rRNA" if feature_idx % 100 == 0 else "tRNA"
+        return (
+            f"     {feature_type:<16}{location}\n"
+            + f'{spacer}/product="synthetic {feature_type} {feature_idx}"\n'
+        )
+    translation = "M" + "".join(amino_acids[rng.integers(0, 20, length // 3 - 2)])
+    translation_lines = textwrap.wrap(f'/translation="{translation}"', 58)
+    return (
+        f"     CDS             {location}\n"
+        + f'{spacer}/locus_tag="SYN_{feature_idx:06d}"\n'
+        + f'{spacer}/product="synthetic protein {feature_idx}"\n'
+        + f'{spacer}/protein_id="SYN_{feature_idx:06d}.1"\n'
+        + "".join(f"{spacer}{line}\n" for line in translation_lines)
+    )
+
+
+def generate_rbh_result(
+    outfile: Union[str, Path],
+    ref_cds_ids: Sequence[str],
+    query_name: str = "query",
+    hit_ratio: float = 0.6,
+    seed: int = 0,
+) -> None:
+    """Generate synthetic MMseqs RBH result TSV file (Query vs Reference CDS)
+
+    Args:
+        outfile (Union[str, Path]): Output RBH result file
+        ref_cds_ids (Sequence[str]): Reference CDS sequence IDs
+        query_name (str, optional): Query name (Used as query sequence ID prefix)
+        hit_ratio (float, optional): Ratio of reference CDS with RBH hit
+        seed (int, optional): Random seed
+    """
+    rng = np.random.default_rng(seed)
+    hit_num = int(len(ref_cds_ids) * hit_ratio)
+    ref_idxs = rng.choice(len(ref_cds_ids), hit_num, replace=False).tolist()
+    fidents = (rng.integers(200, 1001, hit_num) / 1000).tolist()
+    with open(outfile, "w") as f:
+        for query_idx, (ref_idx, fident) in enumerate(zip(ref_idxs, fidents), 1):
+            query_id = f"{query_name}_{query_idx:06d}"
+            f.write(
+                f"{query_id}\t{ref_cds_ids[ref_idx]}\t{fident:.3f}\t300\t30\t1\t1\t"
+                + "300\t1\t300\t1.000E-50\t500\n"
+            )
+
+
+def generate_cog_result(
+    outfile: Union[str, Path],
+    ref_cds_ids: Sequence[str],
+    hit_ratio: float = 0.75,
+    seed: int = 0,
+) -> None:
+    """Generate synthetic COGclassifier result TSV file
+
+    Args:
+        outfile (Union[str, Path]): Output COGclassifier result file
+        ref_cds_ids (Sequence[str]): Reference CDS sequence IDs
+        hit_ratio (float, optional): Ratio of classified CDS
+        seed (int, optional): Random seed
+    """
+    rng = np.random.default_rng(seed)
+    letters = [letter for letter in config.cog_letter2color if letter != "-"]
+    columns = "QUERY_ID,COG_ID,CDD_ID,EVALUE,IDENTITY,GENE_NAME,COG_NAME,COG_LETTER"
+    with open(outfile, "w") as f:
+        f.write("\t".join(columns.split(",") + ["COG_DESCRIPTION"]) + "\n")
+        for i, cds_id in enumerate(ref_cds_ids):
+            if rng.random() >= hit_ratio:
+                continue
+            letter = letters[int(rng.integers(0, len(letters)))]
+            f.write(
+                f"{cds_id}\tCOG{i:04d}\t{i}\t1e-10\t50\tgene\tname\t{letter}\tdesc\n"
+            )
@@ -0,0 +1,77 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Union
+
+from mgcplotter import config
+
+
+@dataclass
+class BatchJob:
+    """Batch Job DataClass"""
+
+    name: str
+    ref_file: Path
+    query_files: List[Path] = field(default_factory=list)
+
+
+def load_batch_manifest(manifest_file: Union[str, Path]) -> List[BatchJob]:
+    """Load batch manifest TSV file
+
+    Each line is `name<TAB>ref_file<TAB>query_files`, where `query_files` are
+    comma separated (optional). Empty lines & lines starting with '#' are ignored.
+    Relative file paths are resolved from manifest file directory.
+
+    Args:
+        manifest_file (Union[str, Path]): Batch manifest TSV file
+
+    Returns:
+        List[BatchJob]: Batch jobs (Each job output is '{outdir}/{name}')
+
+    Raises:
+        ValueError: Invalid manifest contents
+    """
+    manifest_file = Path(manifest_file)
+    base_dir = manifest_file.parent
+    jobs: List[BatchJob] = []
+    err_info = ""
+    with open(manifest_file) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if line.strip() == "" or line.startswith("#"):
+                continue
+            cols = line.split("\t")
+            if len(cols) not in (2, 3) or cols[0] == "":
+                err_info += f"L{line_no}: Invalid format '{line}'\n"
+                continue
+            name, ref_file = cols[0], base_dir / cols[1]
+            query_files = []
+            if len(cols) == 3 and cols[2] != "":
+                query_files = [base_dir / f for f in cols[2].split(",")]
+            if not _is_valid_job_name(name):
+                err_info += (
+                    f"L{line_no}: Invalid name '{name}' (Not single directory name)\n"
+                )
+            if name in [job.name for job in jobs]:
+                err_info += f"L{line_no}: Duplicated name '{name}'\n"
+            for file in [ref_file] + query_files:
+                if not file.exists():
+                    err_info += f"L{line_no}: File not found '{file}'\n"
+            for file in query_files:
+                if file.suffix not in config.valid_query_suffixs:
+                    err_info += f"L{line_no}: '{file.suffix}' is invalid file suffix\n"
+            query_names = [f.with_suffix("").name for f in query_files]
+            if len(query_names) != len(set(query_names)):
+                err_info += f"L{line_no}: Duplicated query file names\n"
+            jobs.append(BatchJob(name, ref_file, query_files))
+    if len(jobs) == 0 and err_info == "":
+        err_info += "No batch job found\n"
+    if err_info != "":
+        raise ValueError(err_info)
+    return jobs
+
+
+def _is_valid_job_name(name: str) -> bool:
+    """Check if job name is single path component (Not reserved output name)"""
+    if any(c in name for c in ("/", "\\")) or Path(name).is_absolute():
+        return False
+    return name not in (".", "..", "panel_rbh")
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+
+def file_hash(file: Union[str, Path]) -> str:
+    """Calculate SHA256 hash of file contents
+
+    Args:
+        file (Union[str, Path]): Target file
+
+    Returns:
+        str: SHA256 hex digest
+    """
+    sha256 = hashlib.sha256()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class SharedCache:
+    """Result cache directory shared across runs & output directories
+
+    Result files are stored by cache key. If total size of cached files exceeds
+    `max_size`, least recently used files are evicted.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_size: int = 1024**3):
+        """Constructor
+
+        Args:
+            cache_dir (Union[str, Path]): Cache directory
+            max_size (int, optional): Max total size of cached files (Bytes)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self, key: str, result_file: Union[str, Path]) -> bool:
+        """Copy cached file to result file
+
+        Args:
+            key (str): Cache key
+            result_file (Union[str, Path]): Result file
+
+        Returns:
+            bool: True if cached file is found, otherwise False
+        """
+        result_file = Path(result_file)
+        cache_file = self._cache_file(key, result_file.suffix)
+        try:
+            shutil.copyfile(cache_file, result_file)
+        except FileNotFoundError:
+            return False
+        try:
+            # Update mtime as last used time for LRU eviction
+            os.utime(cache_file)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def save(self, key: str, result_file: Union[str, Path]) -> None:
+        """Store result file to cache directory
+
+        Args:
+            key (str): Cache key
+            result_file (Union[str, Path]): Result file
+        """
+        result_file = Path(result_file)
+        cache_file = self._cache_file(key, result_file.suffix)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to temporary file & rename, for safe concurrent access
+        tmp_name = f".{cache_file.name}.{os.getpid()}_{threading.get_ident()}.tmp"
+        tmp_cache_file = cache_file.with_name(tmp_name)
+        shutil.copyfile(result_file, tmp_cache_file)
+        tmp_cache_file.replace(cache_file)
+        self.evict()
+
+    def evict(self) -> None:
+        """Evict least recently used files until total size <= `max_size`"""
+        file2stat = {}
+        for cache_file in self.cache_dir.glob("*/*"):
+            if cache_file.name.startswith("."):
+                continue
+            try:
+                file2stat[cache_file] = cache_file.stat()
+            except FileNotFoundError:
+                continue
+        total_size = sum(stat.st_size for stat in file2stat.values())
+        for cache_file, stat in sorted(
+            file2stat.items(), key=lambda item: item[1].st_mtime_ns
+        ):
+            if total_size <= self.max_size:
+                break
+            cache_file.unlink(missing_ok=True)
+            total_size -= stat.st_size
+
+    def _cache_file(self, key: str, suffix: str) -> Path:
+        """Cache file path of key"""
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+
+class ResultCache:
+    """Content-addressed result cache
+
+    Each result file is recorded in manifest file with a key calculated from
+    its input file contents & parameters (e.g. e-value, tool version).
+    Result file is reused only if it exists and its recorded key is unchanged.
+    If shared cache is set, result file is also restored from and stored to it.
+    """
+
+    def __init__(
+        self,
+        manifest_file: Union[str, Path],
+        shared_cache: Optional[SharedCache] = None,
+    ):
+        """Constructor
+
+        Args:
+            manifest_file (Union[str, Path]): Cache manifest json file
+            shared_cache (Optional[SharedCache], optional): Shared cache
+        """
+        self.manifest_file = Path(manifest_file)
+        self.shared_cache = shared_cache
+        self._file_stat2hash: Dict[Tuple[Path, int, int], str] = {}
+        self._manifest: Dict[str, str] = {}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file) as f:
+                    self._manifest = dict(json.load(f))
+            except (ValueError, TypeError):
+                # Broken manifest is ignored (all results are recalculated)
+                self._manifest = {}
+
+    def make_key(self, *inputs: Union[str, Path, int, float]) -> str:
+        """Make cache key from input files & parameters
+
+        Path input is hashed by file contents, other input by string value.
+
+        Returns:
+            str: Cache key
+        """
+        sha256 = hashlib.sha256()
+        for input in inputs:
+            if isinstance(input, Path):
+                value = f"file:{self._file_hash(input)}"
+            else:
+                value = f"{type(input).__name__}:{input}"
+            sha256.update(value.encode() + b"\0")
+        return sha256.hexdigest()
+
+    def is_valid(self, result_file: Union[str, Path], key: str) -> bool:
+        """Check if result file is cached with same key
+
+        Args:
+            result_file (Union[str, Path]): Result file
+            key (str): Cache key
+
+        Returns:
+            bool: Check result
+        """
+        result_file = Path(result_file)
+        return result_file.exists() and self._manifest.get(self._id(result_file)) == key
+
+    def load(self, result_file: Union[str, Path], key: str) -> bool:
+        """Check if result file is cached with same key, or restore it from shared cache
+
+        Args:
+            result_file (Union[str, Path]): Result file
+            key (str): Cache key
+
+        Returns:
+            bool: True if valid result file is available, otherwise False
+        """
+        if self.is_valid(result_file, key):
+            return True
+        if self.shared_cache is not None and self.shared_cache.load(key, result_file):
+            self._update_manifest(result_file, key)
+            return True
+        return False
+
+    def update(
+        self, result_file: Union[str, Path], key: str, share: bool = True
+    ) -> None:
+        """Record result file key to manifest (and store it to shared cache)
+
+        Args:
+            result_file (Union[str, Path]): Result file
+            key (str): Cache key
+            share (bool, optional): If True, store result file to shared cache
+        """
+        self._update_manifest(result_file, key)
+        if self.shared_cache is not None and share:
+            self.shared_cache.save(key, result_file)
+
+    def _update_manifest(self, result_file: Union[str, Path], key: str) -> None:
+        """Record result file key & write manifest file"""
+        self._manifest[self._id(Path(result_file))] = key
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_manifest_file = self.manifest_file.with_suffix(".tmp")
+        with open(tmp_manifest_file, "w") as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        tmp_manifest_file.replace(self.manifest_file)
+
+    def _id(self, result_file: Path) -> str:
+        """Result file id in manifest (Relative path from manifest directory)"""
+        result_file = result_file.resolve()
+        try:
+            return str(result_file.relative_to(self.manifest_file.parent.resolve()))
+        except ValueError:
+            return str(result_file)
+
+    def _file_hash(self, file: Path) -> str:
+        """File contents hash (Memoized per file path, mtime & size)"""
+        file = file.resolve()
+        stat = file.stat()
+        file_stat = (file, stat.st_mtime_ns, stat.st_size)
+        if file_stat not in self._file_stat2hash:
+            self._file_stat2hash[file_stat] = file_hash(file)
+        return self._file_stat2hash[file_stat]
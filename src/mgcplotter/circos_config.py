@@ -1,20 +1,177 @@
+import math
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 import matplotlib as mpl
+import numpy as np
 import pandas as pd
 
 from mgcplotter.genbank import Genbank
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa, pa_csv = None, None
+
+rbh_columns = (
+    "QUERY,TARGET,FIDENT,ALNLEN,MISMATCH,GAPOPEN,QSTART,QEND,TSTART,TEND,EVALUE,BITS"
+).split(",")
+
+
+def format_track_lines(*columns: Union[str, Sequence[Any]]) -> str:
+    """Format Circos data lines from columns in bulk
+
+    Each line is '{column1} {column2} ...', formatted by `str()` of each value.
+    All lines are formatted with a single line template (str columns are embedded).
+
+    Args:
+        *columns (Union[str, Sequence[Any]]): Data columns (e.g. starts, ends, values).
+            A str column is repeated for all lines.
+
+    Returns:
+        str: Formatted lines (Each line ends with newline)
+    """
+    fields, value_columns = [], []
+    for column in columns:
+        if isinstance(column, str):
+            fields.append(column.replace("%", "%%"))
+        else:
+            fields.append("%s")
+            if isinstance(column, np.ndarray):
+                column = column.tolist()
+            value_columns.append(column)
+    template = " ".join(fields) + "\n"
+    if len(value_columns) == 0:
+        return template.replace("%%", "%")
+    return "".join([template % values for values in zip(*value_columns)])
+
+
+def load_rbh_cds_identities(
+    rbh_result_file: Union[str, Path],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Load reference CDS indices & identities from MMseqs RBH result
+
+    Only TARGET & FIDENT columns are read with explicit types
+    (pyarrow CSV reader is used if available). Duplicated targets are
+    removed (first one is kept) and results are sorted by CDS index.
+
+    Args:
+        rbh_result_file (Union[str, Path]): MMseqs RBH result file
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: CDS indices (int64) & identities (float64)
+    """
+    if Path(rbh_result_file).stat().st_size == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+    usecols, dtype = ["TARGET", "FIDENT"], {"TARGET": str, "FIDENT": np.float64}
+    if pa_csv is not None:
+        table = pa_csv.read_csv(
+            rbh_result_file,
+            read_options=pa_csv.ReadOptions(column_names=rbh_columns),
+            parse_options=pa_csv.ParseOptions(delimiter="\t"),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=usecols,
+                column_types={"TARGET": pa.string(), "FIDENT": pa.float64()},
+            ),
+        )
+        targets = table.column("TARGET").to_pylist()
+        fidents = table.column("FIDENT").to_numpy()
+    else:
+        df = pd.read_table(
+            rbh_result_file,
+            header=None,
+            names=rbh_columns,
+            usecols=usecols,
+            dtype=dtype,
+        )
+        targets, fidents = df["TARGET"], df["FIDENT"].to_numpy()
+    cds_idxs = Genbank.parse_cds_idxs(targets)
+    # Unique & sorted CDS indices (First occurrence of duplicated target is kept)
+    uniq_cds_idxs, first_idxs = np.unique(cds_idxs, return_index=True)
+    return uniq_cds_idxs, fidents[first_idxs]
+
+
+def merge_narrow_spans(
+    starts: Sequence[int],
+    ends: Sequence[int],
+    min_length: float,
+    keys: Optional[Sequence[Any]] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Merge adjacent narrow spans with same key (Level of detail aggregation)
+
+    Spans are sorted by start (stable), then each span shorter than `min_length`
+    is merged with next span, if next span is also shorter than `min_length`,
+    has same key (e.g. color) and gap between them is shorter than `min_length`.
+    Merged spans are returned in start order.
+
+    Args:
+        starts (Sequence[int]): Span starts
+        ends (Sequence[int]): Span ends
+        min_length (float): Min span length not to be merged
+        keys (Optional[Sequence[Any]]): Span keys (None: All spans have same key)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Index (in input order) of
+            first span in each merged span, merged span starts & merged span ends
+    """
+    starts, ends = np.asarray(starts), np.asarray(ends)
+    if len(starts) == 0:
+        return np.array([], dtype=np.int64), starts, ends
+    # Feature order (e.g. GenBank file order) is not always sorted by start
+    order = np.argsort(starts, kind="stable")
+    starts, ends = starts[order], ends[order]
+    narrow = (ends - starts) < min_length
+    mergeable = narrow[1:] & narrow[:-1] & ((starts[1:] - ends[:-1]) < min_length)
+    if keys is not None:
+        keys = np.asarray(keys)[order]
+        mergeable &= keys[1:] == keys[:-1]
+    first_idxs = np.flatnonzero(np.concatenate([[True], ~mergeable]))
+    merged_starts = np.minimum.reduceat(starts, first_idxs)
+    merged_ends = np.maximum.reduceat(ends, first_idxs)
+    return order[first_idxs], merged_starts, merged_ends
+
+
+def write_track_file(
+    track_file: Path,
+    *columns: Union[str, Sequence[Any]],
+    chrom: str = "main",
+) -> None:
+    """Write Circos track data file in bulk (Single buffered write)
+
+    Each line is '{chrom} {column1} {column2} ...'.
+
+    Args:
+        track_file (Path): Track data file to write
+        *columns (Union[str, Sequence[Any]]): Track data columns
+            (e.g. starts, ends, values). A str column is repeated for all lines.
+        chrom (str): Chromosome name
+    """
+    contents = format_track_lines(chrom, *columns)
+    with open(track_file, "w") as f:
+        f.write(contents)
+
 
 class CircosConfig:
     """Circos Config Class"""
 
+    # Min auto window size for GC content & GC skew (for small genome e.g. plasmid)
+    min_gc_window_size = 100
+    # Circos image radius [pixel] ('etc/image.conf') & ideogram layout
+    image_radius = 1500
+    ideogram_radius = 0.80
+    ideogram_thickness = 15
+    ideogram_spacing = 0.005
+
     def __init__(
         self,
         ref_gbk: Genbank,
         outdir: Path,
         ticks_labelsize=35,
+        gc_window_size: Optional[int] = None,
+        gc_step_size: Optional[int] = None,
+        lod_pixel_width: float = 1.0,
+        full_detail: bool = False,
         # Radius
         forward_cds_r=0.07,
         reverse_cds_r=0.07,
@@ -33,11 +190,24 @@ class CircosConfig:
         gc_content_n_color: str = "grey",
         gc_skew_p_color: str = "olive",
         gc_skew_n_color: str = "purple",
+        # CDS color assignment (e.g. COG classification color)
+        cds_colors: Optional[Sequence[str]] = None,
     ):
-        """Constructor"""
+        """Constructor
+
+        If `cds_colors` (color of each CDS index) is set, each CDS is drawn with
+        its assigned color instead of forward/reverse CDS color.
+        Adjacent same color features (CDS, rRNA, tRNA, conserved CDS) narrower
+        than `lod_pixel_width` in output image are merged into single span,
+        unless `full_detail=True`.
+        """
         self.ref_gbk = ref_gbk
         self.outdir = outdir
         self.ticks_labelsize = ticks_labelsize
+        self.gc_window_size = gc_window_size
+        self.gc_step_size = gc_step_size
+        self.lod_pixel_width = lod_pixel_width
+        self.full_detail = full_detail
         # Radius
         self.f_cds_r = forward_cds_r
         self.r_cds_r = reverse_cds_r
@@ -58,6 +228,7 @@ class CircosConfig:
         self.gc_skew_p_color = self._to_hex(gc_skew_p_color)
         self.gc_skew_n_color = self._to_hex(gc_skew_n_color)
         self.separate_color = self._to_hex("grey")
+        self.cds_colors = cds_colors
 
         # Setup output directory
         self.outdir.mkdir(exist_ok=True)
@@ -142,13 +313,14 @@ class CircosConfig:
     ###########################################################################
     def _write_karyotype_file(self) -> None:
         """Write karyotype txt"""
+        starts = np.array(self.ref_gbk.contig_offsets, dtype=np.int64)
+        ends = starts + np.array(self.ref_gbk.contig_lengths, dtype=np.int64)
+        band_names = [f"band{i}" for i in range(1, len(starts) + 1)]
+        colors = np.where(np.arange(len(starts)) % 2 == 0, "lgrey", "dgrey")
         contents = f"chr - main 1 0 {self._genome_length} grey\n"
-        colors = ["lgrey", "dgrey"]
-        base_len = 0
-        for idx, contig_seq in enumerate(self.ref_gbk.contig_seqs):
-            start, end, color = base_len, base_len + len(contig_seq), colors[idx % 2]
-            contents += f"band main band{idx+1} band{idx+1} {start} {end} {color}\n"
-            base_len += len(contig_seq)
+        contents += format_track_lines(
+            "band", "main", band_names, band_names, starts, ends, colors
+        )
         with open(self.karyotype_file, "w") as f:
             f.write(contents)
 
@@ -161,10 +333,10 @@ class CircosConfig:
             [
                 "<ideogram>",
                 "<spacing>",
-                "default = 0.005r",
+                "default = {0}r".format(self.ideogram_spacing),
                 "</spacing>",
-                "radius           = 0.80r",
-                "thickness        = 15p",
+                "radius           = {0:.2f}r".format(self.ideogram_radius),
+                "thickness        = {0}p".format(self.ideogram_thickness),
                 "fill             = yes",
                 "stroke_color     = dgrey",
                 "show_bands       = yes",
@@ -272,14 +444,21 @@ class CircosConfig:
             target_strand (Optional[int]): Strand ('1', '-1', 'None')
             color (str): Feature color to be drawn
         """
-        features = self.ref_gbk.extract_all_features(feature_type, target_strand)
-        contents = ""
-        for f in features:
-            start, end, strand = f.location.start, f.location.end, f.strand
-            strand = "+" if strand == 1 else "-"
-            contents += f"main {start} {end} {strand} color={color}\n"
-        with open(feature_file, "w") as f:
-            f.write(contents)
+        table = self.ref_gbk.feature_table
+        idxs = table.search(feature_type, target_strand)
+        starts, ends = table.starts[idxs], table.ends[idxs]
+        strands = np.where(table.strands[idxs] == 1, "+", "-")
+        options: Union[str, List[str]] = f"color={color}"
+        if feature_type == "CDS" and self.cds_colors is not None:
+            cds_idxs = np.searchsorted(table.search("CDS"), idxs)
+            colors = np.asarray(self.cds_colors, dtype=object)[cds_idxs].tolist()
+            # Convert only unique colors to hexcolor
+            color2option = {c: f"color={self._to_hex(c)}" for c in set(colors)}
+            options = [color2option[c] for c in colors]
+        starts, ends, strands, options = self._merge_subpixel_features(
+            starts, ends, strands, options
+        )
+        write_track_file(feature_file, starts, ends, strands, options)
 
     ###########################################################################
     # Add Separate track
@@ -363,17 +542,14 @@ class CircosConfig:
     def _write_gc_content_file(self) -> float:
         """Write GC Content file"""
         gc_content_values = self.ref_gbk.gc_content(self._window_size, self._step_size)
-        gc_content_values = [v - self.ref_gbk.average_gc for v in gc_content_values]
-        contents = ""
-        for i, value in enumerate(gc_content_values):
-            start = i * self._step_size
-            end = start + self._step_size
-            end = self._genome_length if end > self._genome_length else end
-            color = self.gc_content_p_color if value > 0 else self.gc_content_n_color
-            contents += f"main {start} {end} {value} fill_color={color}\n"
-        with open(self.gc_content_file, "w") as f:
-            f.write(contents)
-        return max(abs(v) for v in gc_content_values)
+        values = np.array(gc_content_values) - self.ref_gbk.average_gc
+        self._write_histogram_file(
+            self.gc_content_file,
+            values,
+            self.gc_content_p_color,
+            self.gc_content_n_color,
+        )
+        return float(np.abs(values).max())
 
     ###########################################################################
     # Add GC skew track
@@ -402,16 +578,31 @@ class CircosConfig:
     def _write_gc_skew_file(self) -> float:
         """Write GC Skew file"""
         gc_skew_values = self.ref_gbk.gc_skew(self._window_size, self._step_size)
-        contents = ""
-        for i, value in enumerate(gc_skew_values):
-            start = i * self._step_size
-            end = start + self._step_size
-            end = self._genome_length if end > self._genome_length else end
-            color = self.gc_skew_p_color if value > 0 else self.gc_skew_n_color
-            contents += f"main {start} {end} {value} fill_color={color}\n"
-        with open(self.gc_skew_file, "w") as f:
-            f.write(contents)
-        return max(abs(v) for v in gc_skew_values)
+        values = np.array(gc_skew_values, dtype=float)
+        self._write_histogram_file(
+            self.gc_skew_file, values, self.gc_skew_p_color, self.gc_skew_n_color
+        )
+        return float(np.abs(values).max())
+
+    def _write_histogram_file(
+        self,
+        histogram_file: Path,
+        values: np.ndarray,
+        p_color: str,
+        n_color: str,
+    ) -> None:
+        """Write step size histogram file (GC content, GC skew)
+
+        Args:
+            histogram_file (Path): Histogram file to write
+            values (np.ndarray): Histogram values of each step
+            p_color (str): Color for positive value
+            n_color (str): Color for negative value
+        """
+        starts = np.arange(len(values), dtype=np.int64) * self._step_size
+        ends = np.minimum(starts + self._step_size, self._genome_length)
+        colors = np.where(values > 0, f"fill_color={p_color}", f"fill_color={n_color}")
+        write_track_file(histogram_file, starts, ends, values.tolist(), colors)
 
     ###########################################################################
     # Properties
@@ -423,13 +614,23 @@ class CircosConfig:
 
     @property
     def _window_size(self) -> int:
-        """Window size for GC content & GC skew calculation"""
-        return int(self._genome_length / 1000)
+        """Window size for GC content & GC skew calculation
+
+        If not set, 1/1000 of genome length (at least `min_gc_window_size`)
+        """
+        if self.gc_window_size is not None:
+            return self.gc_window_size
+        return max(int(self._genome_length / 1000), self.min_gc_window_size)
 
     @property
     def _step_size(self) -> int:
-        """Step size for GC content & GC skew calculation"""
-        return int(self._window_size * 0.4)
+        """Step size for GC content & GC skew calculation
+
+        If not set, 40% of window size
+        """
+        if self.gc_step_size is not None:
+            return self.gc_step_size
+        return max(int(self._window_size * 0.4), 1)
 
     @property
     def _chromosome_units(self) -> int:
@@ -490,45 +691,91 @@ class CircosConfig:
         Args:
             rbh_result_file (Path): MMseqs RBH result file
         """
-        df = self._load_rbh_result(rbh_result_file)
-        contents = ""
-        for query, ident in zip(df["TARGET"], df["FIDENT"]):
-            start, end, strand = str(query).split("|")[1].split("_")
-            color = self._get_interpolated_color(self.conserved_cds_color, ident)
-            contents += f"main {start} {end} {strand} color={color}\n"
+        cds_idxs, fidents = load_rbh_cds_identities(rbh_result_file)
+        colors = self._get_interpolated_colors(self.conserved_cds_color, fidents)
+        table = self.ref_gbk.feature_table
+        idxs = table.search("CDS")[cds_idxs]
+        starts, ends = table.starts[idxs], table.ends[idxs]
+        strands = np.where(table.strands[idxs] == 1, "+", "-")
+
+        options = [f"color={color}" for color in colors]
+        starts, ends, strands, options = self._merge_subpixel_features(
+            starts, ends, strands, options
+        )
 
         filename = rbh_result_file.with_suffix(".txt").name
         conserved_cds_config_file = self.conserved_cds_dir / filename
-        with open(conserved_cds_config_file, "w") as f:
-            f.write(contents)
+        write_track_file(conserved_cds_config_file, starts, ends, strands, options)
         self.conserved_cds_files.append(conserved_cds_config_file)
 
-    def _load_rbh_result(self, rbh_result_file: Path) -> pd.DataFrame:
-        header_names = (
-            "QUERY,TARGET,FIDENT,ALNLEN,MISMATCH,GAPOPEN,"
-            + "QSTART,QEND,TSTART,TEND,EVALUE,BITS"
-        ).split(",")
-        df = pd.read_table(rbh_result_file, header=None, names=header_names)
-        return df.drop_duplicates(subset="TARGET").sort_values("TARGET")
+    def _get_interpolated_colors(
+        self, hexcolor: str, interpolate_values: Sequence[float], vmin: float = 0.0
+    ) -> List[str]:
+        """Get interpolate colors from float values (Interpolate: Target color -> white)
 
-    def _get_interpolated_color(
-        self, hexcolor: str, interpolate_value: float, vmin: float = 0.0
-    ) -> str:
-        """Get interpolate color from float value (Interpolate: Target color -> white)
+        Colormap is built only once, and all values are mapped in bulk.
+        Only unique colors (at most colormap size) are converted to hexcolor.
 
         Args:
             hexcolor (str): Target hexcolor
-            interpolate_value (float): Interpolate float value (0.0 - 1.0)
+            interpolate_values (Sequence[float]): Interpolate float values (0.0 - 1.0)
             vmin (float): Minimum under value for interpolation
 
         Returns:
-            str: Interpolated color
+            List[str]: Interpolated colors
         """
         hexcolor = hexcolor if hexcolor.startswith("#") else f"#{hexcolor}"
         cmap = mpl.colors.LinearSegmentedColormap.from_list("cmap", ("white", hexcolor))
         norm = mpl.colors.Normalize(vmin=vmin, vmax=1.0)
-        norm_value = norm(interpolate_value)
-        return mpl.colors.to_hex(cmap(norm_value)).lstrip("#")
+        values = np.asarray(interpolate_values, dtype=float)
+        rgba_colors = cmap(norm(values)).reshape(-1, 4)
+        uniq_rgba_colors, inverse = np.unique(rgba_colors, axis=0, return_inverse=True)
+        uniq_colors = [mpl.colors.to_hex(c).lstrip("#") for c in uniq_rgba_colors]
+        return [uniq_colors[i] for i in inverse.reshape(-1)]
+
+    ###########################################################################
+    # Level of detail
+    ###########################################################################
+    @property
+    def _lod_min_length(self) -> float:
+        """Min feature length [bp] not to be merged by level of detail aggregation
+
+        Length of `lod_pixel_width` on ideogram inner radius (outermost track).
+        Inner tracks are drawn at smaller radius, so merged features are always
+        narrower than `lod_pixel_width` in output image.
+        """
+        inner_r = self.image_radius * self.ideogram_radius - self.ideogram_thickness
+        total_length = self._genome_length * (1 + self.ideogram_spacing)
+        return self.lod_pixel_width * total_length / (2 * math.pi * inner_r)
+
+    def _merge_subpixel_features(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        strands: np.ndarray,
+        options: Union[str, List[str]],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Union[str, List[str]]]:
+        """Merge adjacent same color sub-pixel features (Level of detail)
+
+        Args:
+            starts (np.ndarray): Feature starts
+            ends (np.ndarray): Feature ends
+            strands (np.ndarray): Feature strands
+            options (Union[str, List[str]]): Feature options (e.g. 'color=ff0000')
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, Union[str, List[str]]]:
+                Merged feature starts, ends, strands & options
+        """
+        if self.full_detail or self.lod_pixel_width <= 0:
+            return starts, ends, strands, options
+        keys = None if isinstance(options, str) else options
+        idxs, starts, ends = merge_narrow_spans(
+            starts, ends, self._lod_min_length, keys
+        )
+        if not isinstance(options, str):
+            options = [options[i] for i in idxs.tolist()]
+        return starts, ends, strands[idxs], options
 
     ###########################################################################
     # Util functions
@@ -1,10 +1,14 @@
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import matplotlib as mpl
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
+from mgcplotter.cache import SharedCache
 from mgcplotter.circos_config import CircosConfig
 
 mpl.rcParams["font.family"] = "monospace"
@@ -30,6 +34,7 @@ class CircosLegend:
         cog_letter2desc: Dict[str, str],
         outdir: Path,
         dpi: int = 500,
+        shared_cache: Optional[SharedCache] = None,
     ):
         """Constructor"""
         self.circos_config = circos_config
@@ -37,6 +42,7 @@ class CircosLegend:
         self.cog_letter2desc = cog_letter2desc
         self.outdir = outdir
         self.dpi = dpi
+        self.shared_cache = shared_cache
         self.outdir.mkdir(exist_ok=True)
 
         # Legend files
@@ -45,23 +51,50 @@ class CircosLegend:
         self._cog_letter_png_file = self.outdir / "cog_letter.png"
         self._cog_def_png_file = self.outdir / "cog_definition.png"
 
-    def plot_all_legends(self, svg: bool = True) -> None:
+    def plot_all_legends(self, svg: bool = True, processes: int = 1) -> None:
         """Plot circos all legends
 
+        Each legend is drawn only once and saved as PNG (and SVG).
+        If `processes` > 1, legends are rendered concurrently in process pool.
+        If shared cache is set, legend rendered previously with same contents
+        is copied from it instead of rendering.
+
         Args:
             svg (bool, optional): Output SVG or not
+            processes (int, optional): Number of processes for legend rendering
         """
-        self.plot_track_contents(self._track_contents_png_file)
-        self.plot_cog_letter(self._cog_letter_png_file)
-        self.plot_cog_def(self._cog_def_png_file)
-        self.plot_conserved_cds_ident(self._conserved_cds_ident_png_file)
-        if svg:
-            self.plot_track_contents(self._as_svg(self._track_contents_png_file))
-            self.plot_cog_letter(self._as_svg(self._cog_letter_png_file))
-            self.plot_cog_def(self._as_svg(self._cog_def_png_file))
-            self.plot_conserved_cds_ident(
-                self._as_svg(self._conserved_cds_ident_png_file)
-            )
+        png_file2task = {
+            self._track_contents_png_file: self._track_contents_task(),
+            self._cog_letter_png_file: self._cog_letter_task(),
+            self._cog_def_png_file: self._cog_def_task(),
+            self._conserved_cds_ident_png_file: self._conserved_cds_ident_task(),
+        }
+        render_tasks: List[Tuple[str, Callable, Dict[str, Any], List[Path]]] = []
+        for png_file, (func, kwargs) in png_file2task.items():
+            outfiles = [png_file, self._as_svg(png_file)] if svg else [png_file]
+            key = self._cache_key(kwargs)
+            if self.shared_cache is not None:
+                outfiles = [f for f in outfiles if not self.shared_cache.load(key, f)]
+            if len(outfiles) > 0:
+                render_tasks.append((key, func, kwargs, outfiles))
+
+        if processes <= 1 or len(render_tasks) <= 1:
+            for _, func, kwargs, outfiles in render_tasks:
+                func(outfiles=outfiles, **kwargs)
+        else:
+            max_workers = min(processes, len(render_tasks))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(func, outfiles=outfiles, **kwargs)
+                    for _, func, kwargs, outfiles in render_tasks
+                ]
+                for future in futures:
+                    future.result()
+
+        if self.shared_cache is not None:
+            for key, _, _, outfiles in render_tasks:
+                for outfile in outfiles:
+                    self.shared_cache.save(key, outfile)
 
     def plot_track_contents(self, outfile: Path) -> None:
         """Plot track legend
@@ -69,6 +102,38 @@ class CircosLegend:
         Args:
             outfile (Path): Legend output file
         """
+        func, kwargs = self._track_contents_task()
+        func(outfiles=[outfile], **kwargs)
+
+    def plot_cog_letter(self, outfile: Path) -> None:
+        """Plot COG functional classification letter legend
+
+        Args:
+            outfile (Path): Legend output file
+        """
+        func, kwargs = self._cog_letter_task()
+        func(outfiles=[outfile], **kwargs)
+
+    def plot_cog_def(self, outfile) -> None:
+        """Plot COG functional classification definition legend
+
+        Args:
+            outfile (Path): Legend output file
+        """
+        func, kwargs = self._cog_def_task()
+        func(outfiles=[outfile], **kwargs)
+
+    def plot_conserved_cds_ident(self, outfile: Path) -> None:
+        """Plot conserved cds identity legend
+
+        Args:
+            outfile (Path): Legend output file
+        """
+        func, kwargs = self._conserved_cds_ident_task()
+        func(outfiles=[outfile], **kwargs)
+
+    def _track_contents_task(self) -> Tuple[Callable, Dict[str, Any]]:
+        """Track contents legend plot task (Function & Arguments)"""
         cc = self.circos_config
         legends = []
         if cc.f_cds_r != 0:
@@ -87,105 +152,110 @@ class CircosLegend:
         if cc.gc_skew_r != 0:
             legends.append(Legend(f"#{cc.gc_skew_p_color}", "GC Skew (+)", "^"))
             legends.append(Legend(f"#{cc.gc_skew_n_color}", "GC Skew (-)", "v"))
+        return plot_legend, dict(legends=legends, dpi=self.dpi, title="Track Contents")
 
-        self._plot_legend(legends, outfile, title="Track Contents")
-
-    def plot_cog_letter(self, outfile: Path) -> None:
-        """Plot COG functional classification letter legend
-
-        Args:
-            outfile (Path): Legend output file
-        """
+    def _cog_letter_task(self) -> Tuple[Callable, Dict[str, Any]]:
+        """COG letter legend plot task (Function & Arguments)"""
         legends = []
         for cog_letter, color in self.cog_letter2color.items():
             legends.append(Legend(color, cog_letter, "s"))
-        self._plot_legend(legends, outfile, ncol=6)
+        return plot_legend, dict(legends=legends, dpi=self.dpi, ncol=6)
 
-    def plot_cog_def(self, outfile) -> None:
-        """Plot COG functional classification definition legend
-
-        Args:
-            outfile (Path): Legend output file
-        """
+    def _cog_def_task(self) -> Tuple[Callable, Dict[str, Any]]:
+        """COG definition legend plot task (Function & Arguments)"""
         legends = []
         for cog_letter, color in self.cog_letter2color.items():
             desc = f"{cog_letter} : {self.cog_letter2desc[cog_letter]}"
             legends.append(Legend(color, desc, "s"))
-        self._plot_legend(legends, outfile)
-
-    def plot_conserved_cds_ident(self, outfile: Path) -> None:
-        """Plot conserved cds identity legend
-
-        Args:
-            outfile (Path): Legend output file
+        return plot_legend, dict(legends=legends, dpi=self.dpi)
 
-        Notes:
-            Reference URL for implementation:
-            https://matplotlib.org/2.0.2/examples/api/colorbar_only.html
-        """
-        fig = plt.figure(figsize=(5, 1))
-        ax = fig.add_axes([0.05, 0.5, 0.9, 0.2])  # left, bottom, width, height
+    def _conserved_cds_ident_task(self) -> Tuple[Callable, Dict[str, Any]]:
+        """Conserved CDS identity legend plot task (Function & Arguments)"""
         color = "#" + self.circos_config.conserved_cds_color
-        cmap = mpl.colors.LinearSegmentedColormap.from_list("cmap", ("white", color))
-        norm = mpl.colors.Normalize(vmin=0, vmax=100)
-        cb = mpl.colorbar.ColorbarBase(  # type: ignore
-            ax, cmap=cmap, norm=norm, orientation="horizontal"
-        )
-        cb.set_label(label="Identity(%)", loc="center")
-        cb.ax.invert_xaxis()
-
-        fig.savefig(outfile, dpi=self.dpi)
-        fig.clear()
-
-    def _plot_legend(
-        self,
-        legends: List[Legend],
-        legend_outfile: Path,
-        title: str = "",
-        ncol: int = 1,
-    ) -> None:
-        """Plot legend
+        return plot_identity_colorbar, dict(color=color, dpi=self.dpi)
 
-        Args:
-            legends (List[Legend]): Legend list
-            legend_outfile (Path): Legend output file
-            title (str): Legend title
-            ncol (str): Number of Column
-
-        Notes:
-            Reference URL for implementation:
-            https://stackoverflow.com/questions/4534480/get-legend-as-a-separate-picture-in-matplotlib
-        """
-        # Setup matplotlib params for only plot legend (Disable 'spine', 'axis')
-        for pos in ["left", "right", "top", "bottom"]:
-            plt.gca().spines[pos].set_visible(False)
-        plt.gca().axes.get_xaxis().set_visible(False)
-        plt.gca().axes.get_yaxis().set_visible(False)
-
-        handles = []
-        for legend in legends:
-            marker, color = legend.marker, legend.color
-            handles.append(
-                plt.plot([], [], marker=marker, color=color, linestyle="none")[0]
-            )
-        descs = [legend.desc for legend in legends]
-        mpl_legend = plt.legend(
-            handles,
-            descs,
-            frameon=False,
-            title=title,
-            handletextpad=0,
-            ncol=ncol,
-            columnspacing=1,
-        )
-        fig = mpl_legend.figure
-        fig.canvas.draw()
-        bbox = mpl_legend.get_window_extent().transformed(
-            fig.dpi_scale_trans.inverted()
-        )
-        fig.savefig(legend_outfile, dpi=self.dpi, bbox_inches=bbox)
-        fig.clear()
+    def _cache_key(self, plot_kwargs: Dict[str, Any]) -> str:
+        """Legend cache key (Hash of legend contents & matplotlib version)"""
+        contents = f"legend:{mpl.__version__}:{sorted(plot_kwargs.items())!r}"
+        return hashlib.sha256(contents.encode()).hexdigest()
 
     def _as_svg(self, file: Path) -> Path:
         """Convert filename extension to '.svg'"""
         return file.with_suffix(".svg")
+
+
+def plot_legend(
+    legends: List[Legend],
+    outfiles: Sequence[Path],
+    dpi: int = 500,
+    title: str = "",
+    ncol: int = 1,
+) -> None:
+    """Plot legend (Drawn once & saved to each output file)
+
+    Args:
+        legends (List[Legend]): Legend list
+        outfiles (Sequence[Path]): Legend output files (e.g. PNG & SVG)
+        dpi (int): Output DPI
+        title (str): Legend title
+        ncol (str): Number of Column
+
+    Notes:
+        Reference URL for implementation:
+        https://stackoverflow.com/questions/4534480/get-legend-as-a-separate-picture-in-matplotlib
+    """
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    # Setup matplotlib params for only plot legend (Disable 'spine', 'axis')
+    for pos in ["left", "right", "top", "bottom"]:
+        ax.spines[pos].set_visible(False)
+    ax.get_xaxis().set_visible(False)
+    ax.get_yaxis().set_visible(False)
+
+    handles = []
+    for legend in legends:
+        marker, color = legend.marker, legend.color
+        handles.append(ax.plot([], [], marker=marker, color=color, linestyle="none")[0])
+    descs = [legend.desc for legend in legends]
+    mpl_legend = ax.legend(
+        handles,
+        descs,
+        frameon=False,
+        title=title,
+        handletextpad=0,
+        ncol=ncol,
+        columnspacing=1,
+    )
+    canvas.draw()
+    bbox = mpl_legend.get_window_extent().transformed(fig.dpi_scale_trans.inverted())
+    for outfile in outfiles:
+        fig.savefig(outfile, dpi=dpi, bbox_inches=bbox)
+
+
+def plot_identity_colorbar(
+    color: str, outfiles: Sequence[Path], dpi: int = 500
+) -> None:
+    """Plot identity colorbar legend (Interpolate: white -> color)
+
+    Args:
+        color (str): Max identity color
+        outfiles (Sequence[Path]): Legend output files (e.g. PNG & SVG)
+        dpi (int): Output DPI
+
+    Notes:
+        Reference URL for implementation:
+        https://matplotlib.org/2.0.2/examples/api/colorbar_only.html
+    """
+    fig = Figure(figsize=(5, 1))
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0.05, 0.5, 0.9, 0.2])  # left, bottom, width, height
+    cmap = mpl.colors.LinearSegmentedColormap.from_list("cmap", ("white", color))
+    norm = mpl.colors.Normalize(vmin=0, vmax=100)
+    cb = mpl.colorbar.ColorbarBase(  # type: ignore
+        ax, cmap=cmap, norm=norm, orientation="horizontal"
+    )
+    cb.set_label(label="Identity(%)", loc="center")
+    cb.ax.invert_xaxis()
+    for outfile in outfiles:
+        fig.savefig(outfile, dpi=dpi)
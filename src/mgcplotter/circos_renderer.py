@@ -0,0 +1,431 @@
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+
+mpl.rcParams["svg.fonttype"] = "none"
+
+circos_etc_dir = Path(__file__).parent / "etc"
+# Circos named colors used in MGCplotter config (Defined in Circos 'etc' colors)
+circos_named_colors = {
+    "vlgrey": "#d9d9d9",
+    "lgrey": "#bdbdbd",
+    "grey": "#969696",
+    "dgrey": "#737373",
+    "vdgrey": "#525252",
+    "black": "#000000",
+    "white": "#ffffff",
+}
+
+
+def load_circos_conf(conf_file: Union[str, Path]) -> Dict[str, Any]:
+    """Load Circos config file as nested dict (Subset of Circos config syntax)
+
+    Each `<name> ... </name>` block is loaded as list of dict (`conf[name]`).
+    `<<include file>>` is expanded if file is found (as is, relative to config
+    directory or MGCplotter Circos 'etc' directory), otherwise ignored.
+    Parameter with '*' suffix (e.g. `dir*`) overrides same parameter in block.
+
+    Args:
+        conf_file (Union[str, Path]): Circos config file
+
+    Returns:
+        Dict[str, Any]: Circos config
+    """
+    conf_file = Path(conf_file)
+    root: Dict[str, Any] = {}
+    stack = [root]
+    overrides: Set[Tuple[int, str]] = set()
+    for line in _read_conf_lines(conf_file, [conf_file.parent, circos_etc_dir]):
+        if line.startswith("</"):
+            stack.pop()
+        elif line.startswith("<"):
+            block: Dict[str, Any] = {}
+            stack[-1].setdefault(line.strip("<>").strip(), []).append(block)
+            stack.append(block)
+        elif "=" in line:
+            key, value = [s.strip() for s in line.split("=", 1)]
+            block = stack[-1]
+            if key.endswith("*"):
+                key = key.rstrip("*")
+                overrides.add((id(block), key))
+            elif (id(block), key) in overrides:
+                continue
+            block[key] = value
+    return root
+
+
+def _read_conf_lines(conf_file: Path, search_dirs: Sequence[Path]) -> Iterator[str]:
+    """Read Circos config lines (Comments are removed & includes are expanded)"""
+    with open(conf_file) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line == "":
+                continue
+            if line.startswith("<<include"):
+                target = Path(line[len("<<include") :].rstrip(">").strip())
+                candidates = [target] + [d / target for d in search_dirs]
+                for include_file in candidates:
+                    if include_file.is_file():
+                        yield from _read_conf_lines(include_file, search_dirs)
+                        break
+            else:
+                yield line
+
+
+class CircosRenderer:
+    """Circos Renderer Class (Built-in matplotlib renderer of Circos config)
+
+    Config & track data files written by CircosConfig (karyotype, tiles,
+    histograms, ticks) are drawn with Circos image layout. Each track is drawn
+    as one batched collection instead of one artist per feature.
+    """
+
+    # Max angle between arc vertices [degree]
+    arc_step = 0.5
+
+    def __init__(self, config_file: Union[str, Path]):
+        """Constructor
+
+        Args:
+            config_file (Union[str, Path]): Circos config file
+        """
+        self.config_file = Path(config_file)
+        self.conf = load_circos_conf(self.config_file)
+        image = self.conf["image"][0]
+        ideogram = self.conf["ideogram"][0]
+        self.outdir = Path(image.get("dir", "."))
+        self.outfile = self.outdir / image.get("file", "circos.png")
+        self.svg = image.get("svg", "yes") == "yes"
+        self.image_radius = self._to_px(image.get("radius", "1500p"), 1)
+        self.angle_offset = float(image.get("angle_offset", -90))
+
+        # Ideogram radius ('r': relative to image radius)
+        ideogram_radius = ideogram.get("radius", "0.80r")
+        self.ideogram_outer_r = self._to_px(ideogram_radius, self.image_radius)
+        self.ideogram_inner_r = self.ideogram_outer_r - self._to_px(
+            ideogram.get("thickness", "15p"), self.image_radius
+        )
+        spacing = ideogram.get("spacing", [{}])[0].get("default", "0.005r")
+        self.spacing = float(spacing.rstrip("r"))
+
+        # Karyotype (Single chromosome 'main' is expected)
+        self.chr_color, self.genome_length, self.bands = self._load_karyotype(
+            Path(self.conf["karyotype"])
+        )
+        self.chromosomes_units = float(self.conf.get("chromosomes_units", 1))
+
+    @property
+    def plots(self) -> List[Dict[str, str]]:
+        """Plot (track) configs"""
+        return self.conf.get("plots", [{}])[0].get("plot", [])
+
+    def render(self, svg: Optional[bool] = None) -> List[Path]:
+        """Render Circos plot PNG (and SVG) file
+
+        Args:
+            svg (Optional[bool]): Output SVG or not (Default: image config)
+
+        Returns:
+            List[Path]: Output files
+        """
+        fig = self.plot()
+        svg = self.svg if svg is None else svg
+        outfiles = [self.outfile]
+        if svg:
+            outfiles.append(self.outfile.with_suffix(".svg"))
+        self.outdir.mkdir(parents=True, exist_ok=True)
+        for outfile in outfiles:
+            fig.savefig(outfile, dpi=72)
+        return outfiles
+
+    def plot(self) -> Figure:
+        """Plot Circos figure
+
+        Figure size is image diameter (1 pixel = 1 point at 72 dpi).
+
+        Returns:
+            Figure: Circos figure
+        """
+        size = self.image_radius * 2 / 72
+        fig = Figure(figsize=(size, size), dpi=72, facecolor="white")
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_xlim(-self.image_radius, self.image_radius)
+        ax.set_ylim(-self.image_radius, self.image_radius)
+        ax.set_aspect("equal")
+        ax.axis("off")
+
+        for plot in self.plots:
+            if plot.get("type") == "tile":
+                self._plot_tile_track(ax, plot)
+            elif plot.get("type") == "histogram":
+                self._plot_histogram_track(ax, plot)
+        self._plot_ideogram(ax)
+        self._plot_ticks(ax)
+        return fig
+
+    ###########################################################################
+    # Ideogram & Ticks
+    ###########################################################################
+    def _plot_ideogram(self, ax) -> None:
+        """Plot ideogram (karyotype bands & outline)"""
+        ideogram = self.conf["ideogram"][0]
+        r0, r1 = self.ideogram_inner_r, self.ideogram_outer_r
+        if ideogram.get("show_bands") == "yes" and ideogram.get("fill_bands") == "yes":
+            starts, ends, colors = self.bands
+        else:
+            starts, ends, colors = [0], [self.genome_length], [self.chr_color]
+        self._add_sectors(ax, starts, ends, r0, r1, colors)
+        stroke_width = self._to_px(ideogram.get("stroke_thickness", "0p"), 1)
+        if stroke_width > 0:
+            verts = self._sector_verts(
+                self._to_theta([0]), self._to_theta([self.genome_length]), [r0], [r1]
+            )
+            stroke_color = self._to_color(ideogram.get("stroke_color", "black"))
+            outline = PolyCollection(
+                verts, facecolors="none", edgecolors=[stroke_color]
+            )
+            outline.set_linewidth(stroke_width)
+            ax.add_collection(outline, autolim=False)
+
+    def _plot_ticks(self, ax) -> None:
+        """Plot ticks & tick labels"""
+        ticks = self.conf.get("ticks", [{}])[0]
+        if self.conf.get("show_ticks", "yes") != "yes" or len(ticks) == 0:
+            return
+        radius = self._to_px(ticks.get("radius", "1r"), self.ideogram_outer_r)
+        color = self._to_color(ticks.get("color", "black"))
+        thickness = self._to_px(ticks.get("thickness", "2p"), 1)
+        multiplier = float(ticks.get("multiplier", 1))
+        label_format = ticks.get("format", "%d")
+        show_tick_labels = self.conf.get("show_tick_labels", "yes") == "yes"
+        for tick in ticks.get("tick", []):
+            spacing = float(tick["spacing"].rstrip("u")) * self.chromosomes_units
+            positions = np.arange(0, self.genome_length + 1, spacing)
+            thetas = self._to_theta(positions)
+            size = self._to_px(tick.get("size", "15p"), 1)
+            segments = np.stack(
+                [
+                    self._to_xy(radius, thetas),
+                    self._to_xy(radius + size, thetas),
+                ],
+                axis=1,
+            )
+            lines = LineCollection(segments, colors=[color], linewidths=thickness)
+            ax.add_collection(lines, autolim=False)
+
+            if not show_tick_labels or tick.get("show_label", "no") != "yes":
+                continue
+            label_size = self._to_px(tick.get("label_size", "20p"), 1)
+            label_offset = self._to_px(tick.get("label_offset", "0p"), 1)
+            label_r = radius + size + label_offset
+            for position, theta in zip(positions.tolist(), thetas.tolist()):
+                x, y = self._to_xy(label_r, theta)
+                # Radial label (Flipped on left side to keep readable)
+                rotation = -math.degrees(theta)
+                ha = "left"
+                if math.cos(theta) < -1e-9:
+                    rotation, ha = rotation + 180, "right"
+                ax.text(
+                    x,
+                    y,
+                    label_format % (position * multiplier),
+                    fontsize=label_size,
+                    color=color,
+                    rotation=rotation,
+                    rotation_mode="anchor",
+                    ha=ha,
+                    va="center",
+                )
+
+    ###########################################################################
+    # Tracks
+    ###########################################################################
+    def _plot_tile_track(self, ax, plot: Dict[str, str]) -> None:
+        """Plot tile track (One collection per track)"""
+        df = self._load_track_data(plot["file"], ["START", "END", "STRAND"])
+        r0, r1 = self._track_radius(plot)
+        # Tile layer thickness (pixel) & orientation in track
+        thickness = min(float(plot.get("thickness", r1 - r0)), r1 - r0)
+        orientation = plot.get("orientation", "out")
+        if orientation == "out":
+            tile_r0, tile_r1 = r0, r0 + thickness
+        elif orientation == "in":
+            tile_r0, tile_r1 = r1 - thickness, r1
+        else:
+            center = (r0 + r1) / 2
+            tile_r0, tile_r1 = center - thickness / 2, center + thickness / 2
+        colors = self._option_colors(df["OPTIONS"], "color")
+        self._add_sectors(ax, df["START"], df["END"], tile_r0, tile_r1, colors)
+
+    def _plot_histogram_track(self, ax, plot: Dict[str, str]) -> None:
+        """Plot histogram track (One collection per track)
+
+        Bins are filled from zero value position if value range crosses zero,
+        otherwise from min value position.
+        """
+        df = self._load_track_data(plot["file"], ["START", "END", "VALUE"])
+        r0, r1 = self._track_radius(plot)
+        values = df["VALUE"].to_numpy(dtype=float)
+        vmin = float(plot.get("min", values.min(initial=0)))
+        vmax = float(plot.get("max", values.max(initial=0)))
+        scale = (r1 - r0) / (vmax - vmin) if vmax > vmin else 0
+        value_r = r0 + (np.clip(values, vmin, vmax) - vmin) * scale
+        base_r = r0 + (min(max(0, vmin), vmax) - vmin) * scale
+        colors = self._option_colors(df["OPTIONS"], "fill_color")
+        self._add_sectors(
+            ax,
+            df["START"],
+            df["END"],
+            np.full(len(values), base_r),
+            value_r,
+            colors,
+        )
+
+    def _track_radius(self, plot: Dict[str, str]) -> Tuple[float, float]:
+        """Track radius (r0, r1) in pixel ('r': relative to ideogram inner radius)"""
+        r0 = self._to_px(plot["r0"], self.ideogram_inner_r)
+        r1 = self._to_px(plot["r1"], self.ideogram_inner_r)
+        return r0, r1
+
+    def _load_track_data(
+        self, track_file: Union[str, Path], columns: List[str]
+    ) -> pd.DataFrame:
+        """Load track data file ('{chr} {start} {end} {value} {options}')"""
+        names = ["CHR"] + columns + ["OPTIONS"]
+        if Path(track_file).stat().st_size == 0:
+            return pd.DataFrame(columns=names)
+        return pd.read_csv(
+            track_file, sep=" ", header=None, names=names, dtype={"OPTIONS": str}
+        )
+
+    def _load_karyotype(
+        self, karyotype_file: Path
+    ) -> Tuple[str, int, Tuple[List[int], List[int], List[str]]]:
+        """Load karyotype file (chromosome color, length & bands)"""
+        chr_color, genome_length = "grey", 0
+        starts, ends, colors = [], [], []
+        with open(karyotype_file) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 7 and fields[0] == "chr":
+                    genome_length = int(fields[5])
+                    chr_color = fields[6]
+                elif len(fields) >= 7 and fields[0] == "band":
+                    starts.append(int(fields[4]))
+                    ends.append(int(fields[5]))
+                    colors.append(fields[6])
+        return chr_color, genome_length, (starts, ends, colors)
+
+    ###########################################################################
+    # Geometry & Color
+    ###########################################################################
+    def _add_sectors(
+        self,
+        ax,
+        starts: Sequence[float],
+        ends: Sequence[float],
+        r0: Union[float, Sequence[float]],
+        r1: Union[float, Sequence[float]],
+        colors: Sequence[str],
+    ) -> None:
+        """Add annular sectors as one PolyCollection"""
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        r0 = np.broadcast_to(np.asarray(r0, dtype=float), starts.shape)
+        r1 = np.broadcast_to(np.asarray(r1, dtype=float), starts.shape)
+        verts = self._sector_verts(self._to_theta(starts), self._to_theta(ends), r0, r1)
+        # Convert only unique colors to RGBA
+        uniq_colors, inverse = np.unique(
+            np.asarray(colors, dtype=str), return_inverse=True
+        )
+        uniq_rgba = np.array([self._to_color(c) for c in uniq_colors]).reshape(-1, 4)
+        sectors = PolyCollection(
+            verts,
+            facecolors=uniq_rgba[inverse.reshape(-1)],
+            edgecolors="none",
+            linewidths=0,
+        )
+        ax.add_collection(sectors, autolim=False)
+
+    def _sector_verts(
+        self,
+        theta0: np.ndarray,
+        theta1: np.ndarray,
+        r0: Sequence[float],
+        r1: Sequence[float],
+    ) -> Union[np.ndarray, List[np.ndarray]]:
+        """Annular sector polygon vertices (Outer arc -> Inner arc)
+
+        Number of arc vertices depends on sector angle (`arc_step`), and
+        sectors with same number of vertices are computed in bulk.
+        If all sectors have same number of vertices (e.g. tiles of large genome),
+        vertices are returned as one (N, M, 2) array (PolyCollection fast path).
+        """
+        r0, r1 = np.asarray(r0, dtype=float), np.asarray(r1, dtype=float)
+        spans = np.abs(theta1 - theta0)
+        nums = np.ceil(spans / math.radians(self.arc_step)).astype(int) + 1
+        nums = np.maximum(nums, 2)
+        uniq_nums = np.unique(nums).tolist()
+        verts: List[np.ndarray] = [np.empty((0, 2))] * len(theta0)
+        for num in uniq_nums:
+            idxs = np.flatnonzero(nums == num)
+            ratios = np.linspace(0, 1, num)
+            thetas = theta0[idxs, None] + (theta1 - theta0)[idxs, None] * ratios
+            outer = self._to_xy(r1[idxs, None], thetas)
+            inner = self._to_xy(r0[idxs, None], thetas[:, ::-1])
+            group_verts = np.concatenate([outer, inner], axis=1)
+            if len(uniq_nums) == 1:
+                return group_verts
+            for idx, vert in zip(idxs.tolist(), group_verts):
+                verts[idx] = vert
+        return verts
+
+    def _to_theta(self, positions: Sequence[float]) -> np.ndarray:
+        """Genome positions to Circos angles [radian] (Clockwise from 3 o'clock)
+
+        Genome is drawn clockwise from `angle_offset`, with ideogram spacing
+        (relative to genome length) at the end.
+        """
+        positions = np.asarray(positions, dtype=float)
+        total = self.genome_length * (1 + self.spacing)
+        return np.radians(self.angle_offset + 360 * positions / total)
+
+    def _to_xy(self, r: Union[float, np.ndarray], theta: Any) -> np.ndarray:
+        """Polar coordinate (Circos angle) to xy coordinate (Last axis: x, y)"""
+        return np.stack(
+            np.broadcast_arrays(r * np.cos(theta), -r * np.sin(theta)), axis=-1
+        )
+
+    def _option_colors(self, options: pd.Series, key: str) -> List[str]:
+        """Extract color from track data options (e.g. 'color=ff0000')"""
+        prefix = f"{key}="
+        colors = []
+        for option in options.fillna("").tolist():
+            color = "grey"
+            for kv in option.split(","):
+                if kv.startswith(prefix):
+                    color = kv[len(prefix) :]
+            colors.append(color)
+        return colors
+
+    def _to_px(self, value: str, relative_to: float) -> float:
+        """Convert Circos size value to pixel ('r': relative, 'p': pixel)"""
+        value = str(value).strip()
+        if value.endswith("r"):
+            return float(value[:-1]) * relative_to
+        return float(value.rstrip("p"))
+
+    def _to_color(self, color: str) -> Tuple[float, float, float, float]:
+        """Convert Circos color (named color or hexcolor without '#') to RGBA"""
+        color = circos_named_colors.get(color, color)
+        if mpl.colors.is_color_like(f"#{color}"):
+            return mpl.colors.to_rgba(f"#{color}")
+        return mpl.colors.to_rgba(color)
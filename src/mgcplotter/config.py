@@ -2,8 +2,6 @@ import colorsys
 from dataclasses import dataclass
 from typing import Union
 
-import matplotlib as mpl
-
 fasta_suffixs = (".fa", ".faa", ".fasta")
 gbk_suffixs = (".gb", ".gbk", ".gbff")
 valid_query_suffixs = fasta_suffixs + gbk_suffixs
@@ -115,7 +113,8 @@ def change_luminance(hexcolor: str, value: float) -> str:
     Returns:
         str: Changed hexcolor
     """
-    rgb = mpl.colors.to_rgb(hexcolor)
+    hexcolor = hexcolor.lstrip("#")
+    rgb = [int(hexcolor[i : i + 2], 16) / 255 for i in (0, 2, 4)]
     hls = colorsys.rgb_to_hls(*rgb)
     hue, luminance, saturation = hls
     new_luminance = luminance + value
@@ -125,7 +124,7 @@ def change_luminance(hexcolor: str, value: float) -> str:
         new_luminance = 0.0
     new_hls = [hue, new_luminance, saturation]
     new_rgb = colorsys.hls_to_rgb(*new_hls)
-    return mpl.colors.to_hex(new_rgb)
+    return "#" + "".join(f"{round(v * 255):02x}" for v in new_rgb)
 
 
 for letter, color in cog_letter2color.items():
@@ -1,11 +1,415 @@
+import re
+from dataclasses import dataclass, field
 from functools import cached_property
 from pathlib import Path
-from typing import Any, List, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
 
-from Bio import SeqIO, SeqUtils
+import numpy as np
+from Bio import SeqIO
 from Bio.SeqFeature import FeatureLocation, Seq, SeqFeature
 from Bio.SeqRecord import SeqRecord
 
+# Qualifiers required for plotting (Other qualifiers are discarded in streaming mode)
+required_qualifier_keys = ("protein_id", "product", "translation")
+
+# (type, start, end, strand, record index, qualifiers)
+FeatureRow = Tuple[str, int, int, int, int, Dict[str, List[str]]]
+
+
+@dataclass
+class FeatureTable:
+    """Feature Table DataClass
+
+    Columnar table of genbank features in genome coordinates.
+    Strand is encoded as 1 (forward), -1 (reverse), 0 (unknown).
+    """
+
+    types: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    strands: np.ndarray
+    record_idxs: np.ndarray
+    qualifiers: List[Dict[str, List[str]]]
+    _type2idxs: Dict[str, np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._type2idxs = {t: np.flatnonzero(self.types == t) for t in set(self.types)}
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @staticmethod
+    def from_records(
+        records: Iterable[SeqRecord],
+        qualifier_keys: Optional[Sequence[str]] = None,
+    ) -> "FeatureTable":
+        """Build feature table in a single pass over genbank records
+
+        CDS without translation (pseudogene) and feature that straddle
+        genome start position are excluded.
+
+        Args:
+            records (Iterable[SeqRecord]): Genbank records
+            qualifier_keys (Optional[Sequence[str]]): Qualifier keys to be copied.
+                If None, reference to original qualifiers is stored.
+
+        Returns:
+            FeatureTable: Feature table
+        """
+        rows: List[FeatureRow] = []
+        base_len = 0
+        for record_idx, record in enumerate(records):
+            for f in record.features:
+                start = FeatureTable._to_int(f.location.parts[0].start) + base_len
+                end = FeatureTable._to_int(f.location.parts[-1].end) + base_len
+                if FeatureTable._is_excluded(f.type, start, end, f.qualifiers):
+                    continue
+                if qualifier_keys is None:
+                    qualifiers = f.qualifiers
+                else:
+                    qualifiers = {
+                        k: f.qualifiers[k] for k in qualifier_keys if k in f.qualifiers
+                    }
+                strand = f.location.strand or 0
+                rows.append((f.type, start, end, strand, record_idx, qualifiers))
+            base_len += len(record.seq)
+
+        return FeatureTable.from_rows(rows)
+
+    @staticmethod
+    def from_rows(rows: List[FeatureRow]) -> "FeatureTable":
+        """Build feature table from feature rows
+
+        Args:
+            rows (List[FeatureRow]): (type, start, end, strand, record index,
+                qualifiers) feature rows
+
+        Returns:
+            FeatureTable: Feature table
+        """
+        types, starts, ends, strands, record_idxs, qualifiers = (
+            zip(*rows) if len(rows) != 0 else ([], [], [], [], [], [])
+        )
+        return FeatureTable(
+            types=np.array(types, dtype=object),
+            starts=np.array(starts, dtype=np.int64),
+            ends=np.array(ends, dtype=np.int64),
+            strands=np.array(strands, dtype=np.int8),
+            record_idxs=np.array(record_idxs, dtype=np.int32),
+            qualifiers=list(qualifiers),
+        )
+
+    def search(
+        self,
+        feature_type: str = "CDS",
+        target_strand: Optional[int] = None,
+    ) -> np.ndarray:
+        """Search feature row indices by feature type & strand
+
+        Args:
+            feature_type (str): Feature type to search
+            target_strand (Optional[int]): Target strand to search
+
+        Returns:
+            np.ndarray: Row indices of matched features (in genbank order)
+        """
+        idxs = self._type2idxs.get(feature_type, np.array([], dtype=np.int64))
+        if target_strand is not None:
+            idxs = idxs[self.strands[idxs] == target_strand]
+        return idxs
+
+    @staticmethod
+    def _is_excluded(
+        feature_type: str, start: int, end: int, qualifiers: Dict[str, List[str]]
+    ) -> bool:
+        """Check feature is excluded from feature table or not"""
+        # Exclude pseudogene (no translated gene)
+        if feature_type == "CDS" and "translation" not in qualifiers:
+            return True
+        # Exclude feature that straddle start position
+        return start > end
+
+    @staticmethod
+    def _to_int(value: Any) -> int:
+        """Convert to int (Required for AbstractPostion|ExactPostion)"""
+        return int(str(value).replace("<", "").replace(">", ""))
+
+
+class FastGenbankParser:
+    """Fast Genbank Parser Class
+
+    Scan LOCUS, FEATURES table and ORIGIN block of genbank file directly,
+    and extract only contig sequences & feature table data.
+    ValueError is raised for format unsupported by this parser (e.g. record
+    without ORIGIN sequence, remote or between location), so that caller
+    can fall back to Biopython parser.
+    """
+
+    _sequence_headers = ("CONTIG", "ORIGIN", "BASE COUNT", "WGS", "TSA", "TLS")
+    _qualifier_spacer = " " * 21
+    _range_pattern = re.compile(r"<?(\d+)(?:\.\.>?(\d+))?")
+
+    def __init__(self, qualifier_keys: Sequence[str] = required_qualifier_keys):
+        """Constructor
+
+        Args:
+            qualifier_keys (Sequence[str]): Qualifier keys to be extracted
+        """
+        self.qualifier_keys = qualifier_keys
+
+    def parse(self, gbk_file: Union[str, Path]) -> Tuple[List[str], FeatureTable]:
+        """Parse genbank file
+
+        Args:
+            gbk_file (Union[str, Path]): Genbank file
+
+        Returns:
+            Tuple[List[str], FeatureTable]: Contig sequences & Feature table
+        """
+        contig_seqs: List[str] = []
+        rows: List[FeatureRow] = []
+        base_len = 0
+        with open(gbk_file) as f:
+            for line in f:
+                if line.strip() == "":
+                    continue
+                if not line.startswith("LOCUS"):
+                    raise ValueError(f"Unexpected line '{line.rstrip()}'")
+                if " aa " in f"{line.rstrip()} ":
+                    raise ValueError("Protein genbank file is not supported")
+                line = self._skip_header(f)
+                if line.startswith("FEATURES"):
+                    line = self._read_features(f, rows, base_len, len(contig_seqs))
+                # Skip CONTIG & BASE COUNT lines before ORIGIN
+                while not line.startswith("ORIGIN"):
+                    if line[:12].rstrip() not in ("CONTIG", "BASE COUNT", ""):
+                        raise ValueError(f"Unsupported record line '{line.rstrip()}'")
+                    line = next(f, "//")
+                seq = self._read_sequence(f)
+                contig_seqs.append(seq)
+                base_len += len(seq)
+
+        return contig_seqs, FeatureTable.from_rows(rows)
+
+    def _skip_header(self, handle: TextIO) -> str:
+        """Skip header lines until FEATURES or sequence header line
+
+        Args:
+            handle (TextIO): Genbank file handle positioned after LOCUS line
+
+        Returns:
+            str: FEATURES or sequence header line
+        """
+        for line in handle:
+            if line.startswith("FEATURES"):
+                return line
+            if line[:12].rstrip() in self._sequence_headers:
+                return line
+        raise ValueError("Unexpected end of genbank file")
+
+    def _read_features(
+        self,
+        handle: TextIO,
+        rows: List[FeatureRow],
+        base_len: int,
+        record_idx: int,
+    ) -> str:
+        """Read FEATURES table lines and add feature rows
+
+        Args:
+            handle (TextIO): Genbank file handle positioned after FEATURES line
+            rows (List[FeatureRow]): Feature rows to be added
+            base_len (int): Base length of previous records
+            record_idx (int): Record index
+
+        Returns:
+            str: Sequence header line next to FEATURES table
+        """
+        feature_lines: List[str] = []
+        for line in handle:
+            if line.startswith(self._qualifier_spacer):
+                feature_lines.append(line)
+                continue
+            self._add_feature(rows, feature_lines, base_len, record_idx)
+            if line[:5] == " " * 5 and line[5:6].strip() != "":
+                feature_lines = [line]
+            elif line[:12].rstrip() in self._sequence_headers:
+                return line
+            else:
+                raise ValueError(f"Unsupported feature line '{line.rstrip()}'")
+        raise ValueError("Unexpected end of genbank file")
+
+    def _read_sequence(self, handle: TextIO) -> str:
+        """Read ORIGIN block sequence lines until record end line ('//')
+
+        Args:
+            handle (TextIO): Genbank file handle positioned after ORIGIN line
+
+        Returns:
+            str: Contig sequence (Uppercase)
+        """
+        seq_lines = []
+        for line in handle:
+            if line[9:10] == " ":
+                seq_lines.append(line[10:])
+            elif line.rstrip() == "//":
+                seq = "".join(seq_lines).replace(" ", "").replace("\n", "")
+                if seq == "":
+                    raise ValueError("Record without sequence is not supported")
+                return seq.upper()
+            elif not line[:10].strip().isdigit():
+                raise ValueError(f"Unsupported sequence line '{line.rstrip()}'")
+        raise ValueError("Unexpected end of genbank file")
+
+    def _add_feature(
+        self,
+        rows: List[FeatureRow],
+        feature_lines: List[str],
+        base_len: int,
+        record_idx: int,
+    ) -> None:
+        """Parse feature lines and add feature row
+
+        Args:
+            rows (List[FeatureRow]): Feature rows to be added
+            feature_lines (List[str]): Feature key, location & qualifier lines
+            base_len (int): Base length of previous records
+            record_idx (int): Record index
+        """
+        if len(feature_lines) == 0:
+            return
+        feature_key = feature_lines[0][5:21].strip()
+        if " " in feature_key or feature_lines[0][21:22] in ("", " "):
+            raise ValueError(f"Unsupported feature line '{feature_lines[0]}'")
+        lines = [line[21:].strip() for line in feature_lines]
+        lines = [line for line in lines if line != ""]
+
+        # Multiline location is wrapped by ',' in genbank format
+        location, line_idx = lines[0], 1
+        while location.endswith(",") or location.count("(") != location.count(")"):
+            if line_idx >= len(lines):
+                raise ValueError(f"Unsupported location '{location}'")
+            location += lines[line_idx]
+            line_idx += 1
+        start, end, strand = self._parse_location(location)
+        start, end = start + base_len, end + base_len
+
+        qualifiers = self._parse_qualifiers(lines[line_idx:])
+        if FeatureTable._is_excluded(feature_key, start, end, qualifiers):
+            return
+        qualifiers = {k: qualifiers[k] for k in self.qualifier_keys if k in qualifiers}
+        rows.append((feature_key, start, end, strand, record_idx, qualifiers))
+
+    def _parse_location(self, location: str) -> Tuple[int, int, int]:
+        """Parse location string (Same rule as Biopython FeatureLocation)
+
+        Args:
+            location (str): Location string (e.g. 'complement(join(1..10,20..>30))')
+
+        Returns:
+            Tuple[int, int, int]: Start of first part, end of last part, strand
+        """
+        strand, operator = 1, ""
+        if location.startswith("complement(") and location.endswith(")"):
+            location, strand = location[11:-1], -1
+        for operator in ("join(", "order("):
+            if location.startswith(operator) and location.endswith(")"):
+                location = location[len(operator) : -1]
+                break
+        else:
+            operator = ""
+        part_locations = location.split(",")
+        if len(part_locations) > 1 and operator == "":
+            raise ValueError(f"Unsupported location '{location}'")
+        # Biopython reverses parts order of 'complement(join(...))' location
+        if strand == -1:
+            part_locations = part_locations[::-1]
+
+        parts: List[Tuple[int, int, int]] = []
+        for part_location in part_locations:
+            part_strand = strand
+            if (
+                part_location.startswith("complement(")
+                and part_location.endswith(")")
+                and strand == 1
+            ):
+                part_location, part_strand = part_location[11:-1], -1
+            match = self._range_pattern.fullmatch(part_location)
+            if match is None:
+                raise ValueError(f"Unsupported location '{location}'")
+            start, end = int(match.group(1)), int(match.group(2) or match.group(1))
+            if start > end:
+                raise ValueError(f"Unsupported location '{location}'")
+            parts.append((start - 1, end, part_strand))
+
+        part_strands = set(p[2] for p in parts)
+        strand = part_strands.pop() if len(part_strands) == 1 else 0
+        return parts[0][0], parts[-1][1], strand
+
+    def _parse_qualifiers(self, lines: List[str]) -> Dict[str, List[str]]:
+        """Parse qualifier lines (Same rule as Biopython qualifiers)
+
+        Args:
+            lines (List[str]): Qualifier lines
+
+        Returns:
+            Dict[str, List[str]]: Qualifiers
+        """
+        qualifiers: Dict[str, List[str]] = {}
+        text = "\n".join(lines)
+        if text == "":
+            return qualifiers
+        if not text.startswith("/"):
+            raise ValueError(f"Unsupported qualifier line '{lines[0]}'")
+
+        # Each piece starts with new qualifier line ('/key=value')
+        pieces = text[1:].split("\n/")
+        piece_idx = 0
+        while piece_idx < len(pieces):
+            piece = pieces[piece_idx]
+            piece_idx += 1
+            key, sep, value = piece.partition("=")
+            if sep == "" or "\n" in key:
+                if "\n" in piece:
+                    raise ValueError(f"Unsupported qualifier line '{piece}'")
+                # Valueless qualifier (e.g. '/pseudo')
+                if piece in self.qualifier_keys or piece == "translation":
+                    qualifiers.setdefault(piece, [""])
+                continue
+            if value.startswith(" ") and value.lstrip().startswith('"'):
+                value = value.lstrip()
+            if value.startswith('"') and not value.startswith('"\n'):
+                # Quoted value continues until a line ends with '"'
+                while not value.endswith('"') and not any(
+                    v.endswith('"') for v in value.split("\n")
+                ):
+                    if piece_idx >= len(pieces):
+                        raise ValueError(f"Unclosed qualifier value '{value}'")
+                    value += "\n/" + pieces[piece_idx]
+                    piece_idx += 1
+            # Translation is always required to detect pseudogene
+            if key not in self.qualifier_keys and key != "translation":
+                continue
+            value = value.replace("\n", " ")
+            if len(value) > 1 and value[0] == '"' and value[-1] == '"':
+                value = value[1:-1]
+            value = value.replace('""', '"')
+            if key == "translation":
+                value = "".join(value.split())
+            qualifiers.setdefault(key, []).append(value)
+        return qualifiers
+
 
 class Genbank:
     """Genbank Class"""
@@ -14,36 +418,114 @@ class Genbank:
         self,
         gbk_file: Union[str, Path],
         name: str = "",
+        streaming: bool = False,
+        fast_parser: bool = False,
     ):
         """Constructor
 
         Args:
             gbk_file (Union[str, StringIO, Path]): Genbank file
             name (str, optional): Name
+            streaming (bool, optional): If True, extract only sequences & feature
+                data required for plotting during parse, and discard SeqRecords
+                to reduce memory usage.
+            fast_parser (bool, optional): If True, parse genbank file by fast
+                built-in parser in streaming mode. Biopython parser is used
+                instead if file contains format unsupported by fast parser.
         """
         self.gbk_file: Path = Path(gbk_file)
         self.name: str = name if name != "" else self.gbk_file.with_suffix("").name
-        self._records: List[SeqRecord] = list(SeqIO.parse(gbk_file, "genbank"))
+        self.streaming = streaming or fast_parser
+        self.parser_name = "biopython"
+        if self.streaming:
+            self._records: List[SeqRecord] = []
+            self._load_streaming(gbk_file, fast_parser)
+        else:
+            self._records = list(SeqIO.parse(gbk_file, "genbank"))
+
+    def _load_streaming(
+        self, gbk_file: Union[str, Path], fast_parser: bool = False
+    ) -> None:
+        """Load contig sequences & feature table without keeping SeqRecords
+
+        Args:
+            gbk_file (Union[str, StringIO, Path]): Genbank file
+            fast_parser (bool, optional): Try fast built-in parser or not
+        """
+        if fast_parser and isinstance(gbk_file, (str, Path)):
+            try:
+                contig_seqs, feature_table = FastGenbankParser().parse(gbk_file)
+            except ValueError:
+                pass  # Fall back to Biopython parser
+            else:
+                self.__dict__["contig_seqs"] = contig_seqs
+                self.__dict__["feature_table"] = feature_table
+                self.parser_name = "fast"
+                return
+
+        contig_seqs = []
 
-    @property
+        def parse_records() -> Iterator[SeqRecord]:
+            for record in SeqIO.parse(gbk_file, "genbank"):
+                contig_seqs.append(str(record.seq))
+                yield record
+
+        feature_table = FeatureTable.from_records(
+            parse_records(), required_qualifier_keys
+        )
+        # Set loaded data as cached property values
+        self.__dict__["contig_seqs"] = contig_seqs
+        self.__dict__["feature_table"] = feature_table
+
+    @cached_property
     def genome_length(self) -> int:
         """Genome sequence length"""
         return len(self.genome_seq)
 
-    @property
+    @cached_property
     def genome_seq(self) -> str:
         """Genome sequence (join all contig sequences)"""
         return "".join(self.contig_seqs)
 
-    @property
+    @cached_property
     def contig_seqs(self) -> List[str]:
         """Contig sequences"""
         return [str(r.seq) for r in self._records]
 
+    @cached_property
+    def contig_lengths(self) -> List[int]:
+        """Contig sequence lengths"""
+        return [len(seq) for seq in self.contig_seqs]
+
+    @cached_property
+    def contig_offsets(self) -> List[int]:
+        """Contig start offsets in genome sequence"""
+        offsets, base_len = [], 0
+        for contig_length in self.contig_lengths:
+            offsets.append(base_len)
+            base_len += contig_length
+        return offsets
+
+    def clear_cache(self) -> None:
+        """Clear cached sequence data
+
+        Sequence, contig and GC calculation data are computed only once
+        and cached. Call this method after mutating genbank records.
+        In streaming mode, loaded contig sequences & feature table are kept.
+        """
+        keep_names = ("contig_seqs", "feature_table") if self.streaming else ()
+        for name, attr in vars(type(self)).items():
+            if isinstance(attr, cached_property) and name not in keep_names:
+                self.__dict__.pop(name, None)
+
     @cached_property
     def average_gc(self) -> float:
         """Average GC content"""
-        return SeqUtils.GC(self.genome_seq)
+        gc_count = sum(int(cumsum[-1]) for cumsum in self._gc_base2cumsum.values())
+        try:
+            return gc_count * 100.0 / self.genome_length
+        except ZeroDivisionError:
+            return 0.0
 
     def gc_skew(self, window_size: int = 5000, step_size: int = 2000) -> List[float]:
         """Calculate GC skew in sliding window
@@ -55,23 +537,13 @@ class Genbank:
         Returns:
             List[float]: GC skew values in sliding window
         """
-        gc_skew_values = []
-        seq = self.genome_seq
-        for i in range(0, len(seq), step_size):
-            start_pos = i - int(window_size / 2)
-            start_pos = 0 if start_pos < 0 else start_pos
-            end_pos = i + int(window_size / 2)
-            end_pos = len(seq) if end_pos > len(seq) else end_pos
-
-            subseq = seq[start_pos:end_pos]
-            g = subseq.count("G") + subseq.count("g")
-            c = subseq.count("C") + subseq.count("c")
-            try:
-                skew = (g - c) / float(g + c)
-            except ZeroDivisionError:
-                skew = 0.0
-            gc_skew_values.append(skew)
-        return gc_skew_values
+        starts, ends = self._sliding_windows(window_size, step_size)
+        g = self._count_base("G", starts, ends)
+        c = self._count_base("C", starts, ends)
+        gc = g + c
+        skew = np.zeros(len(gc), dtype=np.float64)
+        np.divide(g - c, gc, out=skew, where=gc != 0)
+        return skew.tolist()
 
     def gc_content(self, window_size: int = 5000, step_size: int = 2000) -> List[float]:
         """Calculate GC content in sliding window
@@ -83,17 +555,67 @@ class Genbank:
         Returns:
             List[float]: GC content values in sliding window
         """
-        gc_content_values = []
-        seq = self.genome_seq
-        for i in range(0, len(seq), step_size):
-            start_pos = i - int(window_size / 2)
-            start_pos = 0 if start_pos < 0 else start_pos
-            end_pos = i + int(window_size / 2)
-            end_pos = len(seq) if end_pos > len(seq) else end_pos
+        starts, ends = self._sliding_windows(window_size, step_size)
+        gc = sum(self._count_base(base, starts, ends) for base in self._gc_base2cumsum)
+        size = ends - starts
+        gc_content = np.zeros(len(size), dtype=np.float64)
+        np.divide(gc * 100.0, size, out=gc_content, where=size != 0)
+        return gc_content.tolist()
+
+    @cached_property
+    def _gc_base2cumsum(self) -> Dict[str, np.ndarray]:
+        """Cumulative count of G, C, S(=G or C) bases in genome sequence
+
+        Count is case insensitive and each array has 'genome length + 1' size,
+        so that base count of `genome_seq[start:end]` is `cumsum[end] - cumsum[start]`.
+        """
+        seq = np.frombuffer(self.genome_seq.encode(), dtype=np.uint8)
+        base2cumsum = {}
+        for base in ("G", "C", "S"):
+            is_base = (seq == ord(base)) | (seq == ord(base.lower()))
+            cumsum = np.zeros(len(seq) + 1, dtype=np.int32)
+            np.cumsum(is_base, out=cumsum[1:])
+            base2cumsum[base] = cumsum
+        return base2cumsum
+
+    def _count_base(
+        self, base: str, starts: np.ndarray, ends: np.ndarray
+    ) -> np.ndarray:
+        """Count base in each `genome_seq[start:end]` region
+
+        Args:
+            base (str): Target base ('G', 'C', 'S')
+            starts (np.ndarray): Start positions
+            ends (np.ndarray): End positions
+
+        Returns:
+            np.ndarray: Base counts
+        """
+        cumsum = self._gc_base2cumsum[base]
+        return cumsum[ends] - cumsum[starts]
+
+    def _sliding_windows(
+        self, window_size: int, step_size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get sliding window start & end positions (Clipped by genome edges)
 
-            subseq = seq[start_pos:end_pos]
-            gc_content_values.append(SeqUtils.GC(subseq))
-        return gc_content_values
+        Args:
+            window_size (int): Window size
+            step_size (int): Step size
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Window start & end positions
+        """
+        seq_len = self.genome_length
+        centers = np.arange(0, seq_len, step_size, dtype=np.int64)
+        starts = np.clip(centers - int(window_size / 2), 0, None)
+        ends = np.clip(centers + int(window_size / 2), None, seq_len)
+        return starts, ends
+
+    @cached_property
+    def feature_table(self) -> FeatureTable:
+        """Feature table of all records (Built in a single pass)"""
+        return FeatureTable.from_records(self._records)
 
     def extract_all_features(
         self,
@@ -108,34 +630,18 @@ class Genbank:
         Returns:
             List[SeqFeature]: All features
         """
+        table = self.feature_table
         extract_features = []
-        base_len = 0
-        for record in self._records:
-            features = [f for f in record.features if f.type == feature_type]
-            for f in features:
-                if feature_type == "CDS":
-                    # Exclude pseudogene (no translated gene)
-                    translation = f.qualifiers.get("translation", [None])[0]
-                    if translation is None:
-                        continue
-                start = self._to_int(f.location.parts[0].start) + base_len
-                end = self._to_int(f.location.parts[-1].end) + base_len
-                # Exclude feature that straddle start position
-                if start > end:
-                    continue
-                # Extract only target strand feature
-                if target_strand is not None and f.strand != target_strand:
-                    continue
-
-                extract_features.append(
-                    SeqFeature(
-                        location=FeatureLocation(start, end, f.strand),
-                        type=f.type,
-                        qualifiers=f.qualifiers,
-                    ),
-                )
-            base_len += len(record.seq)
-
+        for idx in table.search(feature_type, target_strand):
+            start, end = int(table.starts[idx]), int(table.ends[idx])
+            strand = int(table.strands[idx]) or None
+            extract_features.append(
+                SeqFeature(
+                    location=FeatureLocation(start, end, strand),
+                    type=feature_type,
+                    qualifiers=table.qualifiers[idx],
+                ),
+            )
         return extract_features
 
     def write_cds_fasta(
@@ -144,21 +650,27 @@ class Genbank:
     ):
         """Write CDS protein features fasta file
 
+        Sequence ID is `GENE{CDS number}[_{protein_id}]|{start}_{end}_{strand}|`.
+        CDS number (1-based) is used as CDS index (see `parse_cds_idxs`).
+
         Args:
             fasta_outfile (Union[str, Path]): CDS fasta file
         """
-        features = self.extract_all_features("CDS", None)
+        table = self.feature_table
+        cds_idxs = table.search("CDS", None)
+        starts = table.starts[cds_idxs].tolist()
+        ends = table.ends[cds_idxs].tolist()
+        strands = table.strands[cds_idxs].tolist()
         cds_seq_records: List[SeqRecord] = []
-        for idx, feature in enumerate(features, 1):
-            qualifiers = feature.qualifiers
+        for idx, (row_idx, start, end, strand) in enumerate(
+            zip(cds_idxs, starts, ends, strands), 1
+        ):
+            qualifiers = table.qualifiers[row_idx]
             protein_id = qualifiers.get("protein_id", [None])[0]
             product = qualifiers.get("product", [""])[0]
             translation = qualifiers.get("translation", [None])[0]
 
-            start = self._to_int(feature.location.start)
-            end = self._to_int(feature.location.end)
-            strand = "+" if feature.strand == 1 else "-"
-
+            strand = "+" if strand == 1 else "-"
             location_id = f"|{start}_{end}_{strand}|"
             if protein_id is None:
                 seq_id = f"GENE{idx:06d}{location_id}"
@@ -172,6 +684,23 @@ class Genbank:
 
         SeqIO.write(cds_seq_records, fasta_outfile, "fasta-2line")
 
+    @staticmethod
+    def parse_cds_idxs(seq_ids: Iterable[str]) -> np.ndarray:
+        """Parse CDS indices from CDS fasta sequence IDs (`write_cds_fasta` format)
+
+        Args:
+            seq_ids (Iterable[str]): CDS fasta sequence IDs (e.g. 'GENE000001|...')
+
+        Returns:
+            np.ndarray: 0-based CDS indices (Index of `feature_table.search("CDS")`)
+        """
+        # 'GENE000001_WP_000001.1|300_1000_+|' -> 1
+        cds_numbers = [
+            int(str(seq_id)[4:].partition("|")[0].partition("_")[0])
+            for seq_id in seq_ids
+        ]
+        return np.array(cds_numbers, dtype=np.int64) - 1
+
     def write_genome_fasta(
         self,
         outfile: Union[str, Path],
@@ -184,7 +713,3 @@ class Genbank:
         write_seq = self.genome_seq
         with open(outfile, "w") as f:
             f.write(f">{self.name}\n{write_seq}\n")
-
-    def _to_int(self, value: Any) -> int:
-        """Convert to int (Required for AbstractPostion|ExactPostion)"""
-        return int(str(value).replace("<", "").replace(">", ""))
@@ -1,23 +1,32 @@
 #!/usr/bin/env python3
 import argparse
+import itertools
 import json
+import multiprocessing
 import os
 import platform
 import shutil
 import subprocess as sp
+import sys
 import tempfile
-from collections import defaultdict
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-
-import matplotlib as mpl
-import pandas as pd
-from cogclassifier import cogclassifier
+from typing import Any, Dict, List, Optional, Tuple
 
 from mgcplotter import config
-from mgcplotter.circos_config import CircosConfig
-from mgcplotter.circos_legend import CircosLegend
-from mgcplotter.genbank import Genbank
+from mgcplotter.batch import BatchJob, load_batch_manifest
+from mgcplotter.cache import ResultCache, SharedCache, file_hash
+from mgcplotter.profiler import StageProfiler, run_command
+
+# Heavy dependencies (matplotlib, pandas, Biopython, COGclassifier) are imported
+# in the workflow stages that use them, to keep CLI startup fast.
 
 __version__ = "1.0.1"
 
@@ -29,14 +38,35 @@ def main():
 
     # Copy circos 'etc' config directory to current directory
     # Required if Circos is installed in unusual location
-    circos_etc_dir = Path(__file__).parent / "etc"
-    shutil.copytree(circos_etc_dir, "etc", dirs_exist_ok=True)
+    use_circos = args.renderer == "circos"
+    if use_circos:
+        circos_etc_dir = Path(__file__).parent / "etc"
+        shutil.copytree(circos_etc_dir, "etc", dirs_exist_ok=True)
 
-    # Run MGCplotter workflow
-    run(**args.__dict__)
+    # Run MGCplotter workflow (or batch workflow)
+    kwargs = args.__dict__
+    batch_manifest = kwargs.pop("batch_manifest")
+    batch_job_num = kwargs.pop("batch_job_num")
+    batch_circos_job_num = kwargs.pop("batch_circos_job_num")
+    panel_files = kwargs.pop("panel_files")
+    failed_job_names: List[str] = []
+    if batch_manifest is not None:
+        jobs = load_batch_manifest(batch_manifest)
+        failed_job_names = run_batch(
+            jobs, batch_job_num, batch_circos_job_num, **kwargs
+        )
+    elif len(panel_files) > 0:
+        failed_job_names = run_panel(
+            panel_files, batch_job_num, batch_circos_job_num, **kwargs
+        )
+    else:
+        run(**kwargs)
 
     # Delete 'etc' config directory after run
-    shutil.rmtree("etc", ignore_errors=True)
+    if use_circos:
+        shutil.rmtree("etc", ignore_errors=True)
+    if len(failed_job_names) > 0:
+        sys.exit(f"Failed batch jobs: {', '.join(failed_job_names)}")
 
 
 def run(
@@ -47,7 +77,15 @@ def run(
     mmseqs_evalue: float,
     thread_num: int,
     force: bool,
+    job_num: int = 1,
+    cache_dir: Optional[Path] = None,
+    cache_max_size: int = 1024,
+    legend_cache_dir: Optional[Path] = None,
     ticks_labelsize: int = 35,
+    gc_window_size: Optional[int] = None,
+    gc_step_size: Optional[int] = None,
+    lod_pixel_width: float = 1.0,
+    full_detail: bool = False,
     # Radius
     forward_cds_r: float = 0.07,
     reverse_cds_r: float = 0.07,
@@ -68,48 +106,166 @@ def run(
     gc_content_n_color: str = "grey",
     gc_skew_p_color: str = "olive",
     gc_skew_n_color: str = "purple",
-) -> None:
-    """Run MGCplotter workflow"""
+    skip_circos: bool = False,
+    renderer: str = "circos",
+    profile: bool = False,
+    profile_detail: bool = False,
+    cog_lock: Optional[Any] = None,
+    reuse_rbh_results: bool = False,
+) -> Path:
+    """Run MGCplotter workflow
+
+    Circos plot is drawn by Circos (`renderer='circos'`) or built-in
+    matplotlib renderer (`renderer='matplotlib'`).
+    If `profile=True`, wall time, CPU time & peak RSS of each stage are written
+    to '{outdir}/profile/report.json' (`profile_detail=True`: cProfile stats of
+    in-process stages & tracemalloc peak memory are also recorded).
+    If `cog_lock` is set, COGclassifier run is serialized by the lock
+    (e.g. batch workers sharing same COGclassifier database directory).
+    If `reuse_rbh_results=True`, cached query CDS fasta & RBH results are reused
+    even if `force=True` (e.g. derived from panel RBH table). Other results are
+    still forced to be regenerated.
+
+    Returns:
+        Path: Circos config file (Circos is not run if `skip_circos=True`)
+    """
+    from mgcplotter.circos_config import CircosConfig
+    from mgcplotter.circos_legend import CircosLegend
+    from mgcplotter.genbank import Genbank
+
     # Setup directory
     outdir.mkdir(exist_ok=True)
     rbh_dir = outdir / "rbh_search"
     rbh_dir.mkdir(exist_ok=True)
     add_bin_path()
+    shared_cache = None
+    if cache_dir is not None:
+        shared_cache = SharedCache(cache_dir, max_size=cache_max_size * 1024**2)
+    cache = ResultCache(outdir / "cache_manifest.json", shared_cache)
+    profiler = StageProfiler(outdir / "profile", profile, profile_detail)
 
     # Search conserved CDS by MMseqs RBH method
-    ref_gbk = Genbank(ref_file)
+    with profiler.stage("reference_genbank_parse"):
+        ref_gbk = Genbank(ref_file, fast_parser=True)
     ref_faa_file = outdir / "reference_cds.faa"
-    ref_gbk.write_cds_fasta(ref_faa_file)
+    with profiler.stage("reference_cds_fasta"):
+        ref_gbk.write_cds_fasta(ref_faa_file)
     rbh_result_files: List[Path] = []
+    search_query_faa_files: List[Path] = []
+    search_rbh_result_files: List[Path] = []
+    search_rbh_keys: List[str] = []
+    force_rbh = force and not reuse_rbh_results
     for idx, query_file in enumerate(query_files, 1):
         query_num = len(query_files)
         if idx == 1:
             em_print(f"Search Conserved CDS ({query_num} Query vs Reference)")
         # Setup query CDS faa file
         query_faa_file = rbh_dir / query_file.with_suffix(".faa").name
-        if query_file.suffix in config.fasta_suffixs:
-            shutil.copy(query_file, query_faa_file)
-        elif query_file.suffix in config.gbk_suffixs and not query_faa_file.exists():
-            Genbank(query_file).write_cds_fasta(query_faa_file)
+        query_faa_key = cache.make_key(query_file, __version__)
+        if force_rbh or not cache.load(query_faa_file, query_faa_key):
+            with profiler.stage(f"query_cds_fasta:{query_faa_file.stem}"):
+                if query_file.suffix in config.fasta_suffixs:
+                    shutil.copy(query_file, query_faa_file)
+                elif query_file.suffix in config.gbk_suffixs:
+                    query_gbk = Genbank(query_file, fast_parser=True)
+                    query_gbk.write_cds_fasta(query_faa_file)
+            cache.update(query_faa_file, query_faa_key)
         # Run MMseqs RBH search
         query_name = query_file.with_suffix("").name
         ref_name = ref_file.with_suffix("").name
         target_info = f"{query_name} vs {ref_name}[reference]"
         rbh_result_file = rbh_dir / f"{query_name}_vs_reference_rbh.tsv"
-        if force or not rbh_result_file.exists():
+        rbh_key = get_rbh_cache_key(cache, query_faa_file, ref_faa_file, mmseqs_evalue)
+        if rbh_result_file in search_rbh_result_files:
+            # Same name query is searched only once (not concurrently)
+            print(f"# Reuse MMseqs RBH search result ({target_info})")
+        elif force_rbh or not cache.load(rbh_result_file, rbh_key):
             print(f"# Run MMseqs RBH search ({target_info})")
-            run_mmseqs_rbh_search(
-                query_faa_file, ref_faa_file, rbh_result_file, mmseqs_evalue, thread_num
-            )
+            search_query_faa_files.append(query_faa_file)
+            search_rbh_result_files.append(rbh_result_file)
+            search_rbh_keys.append(rbh_key)
         else:
             print(f"# Reuse previous MMseqs RBH search result ({target_info})")
         rbh_result_files.append(rbh_result_file)
 
+    # Run COGclassifier in parallel with MMseqs RBH search (Threads are split)
+    cog_dir = outdir / "cogclassifier"
+    cog_classifier_result_file = cog_dir / "classifier_result.tsv"
+    cog_key = ""
+    cog_future: Optional[Future] = None
+    rbh_thread_num = thread_num
+    if assign_cog_color:
+        import cogclassifier as cogclassifier_pkg
+
+        cog_key = cache.make_key(
+            ref_faa_file, cog_evalue, cogclassifier_pkg.__version__
+        )
+    if assign_cog_color and (
+        force or not cache.is_valid(cog_classifier_result_file, cog_key)
+    ):
+        cog_thread_num = thread_num
+        if len(search_query_faa_files) > 0:
+            cog_thread_num = max(thread_num // 2, 1)
+            rbh_thread_num = max(thread_num - cog_thread_num, 1)
+        em_print("Run COGclassifier for Functional Classification of Reference CDSs")
+        print(f"# Run COGclassifier in background ({cog_thread_num} threads)")
+        cog_executor = ThreadPoolExecutor(max_workers=1)
+        cog_future = cog_executor.submit(
+            profiler.wrap("cogclassifier", run_cogclassifier),
+            ref_faa_file,
+            cog_dir,
+            cog_thread_num,
+            cog_evalue,
+            cog_lock,
+        )
+        cog_executor.shutdown(wait=False)
+
+    run_mmseqs_rbh_searches(
+        search_query_faa_files,
+        ref_faa_file,
+        search_rbh_result_files,
+        mmseqs_evalue,
+        rbh_thread_num,
+        job_num,
+        ref_db_dir=rbh_dir / "reference_db",
+        profiler=profiler,
+    )
+    for rbh_result_file, rbh_key in zip(search_rbh_result_files, search_rbh_keys):
+        if rbh_result_file.exists():
+            cache.update(rbh_result_file, rbh_key)
+
+    # Wait COGclassifier for Functional Classification of Reference CDSs
+    cds_colors: Optional[List[str]] = None
+    if assign_cog_color:
+        if cog_future is not None:
+            cog_future.result()
+            print("# Finished COGclassifier")
+            cache.update(cog_classifier_result_file, cog_key, share=False)
+        else:
+            em_print(
+                "Run COGclassifier for Functional Classification of Reference CDSs"
+            )
+            print("# Reuse previous COGclassifier result")
+
+        # Assign COG color to reference CDS
+        if cog_color_json is not None:
+            with open(cog_color_json) as f:
+                config.cog_letter2color = json.load(f)
+        cds_colors = get_cds_colors(
+            cog_classifier_result_file,
+            config.cog_letter2color,
+            len(ref_gbk.feature_table.search("CDS")),
+        )
+
     # Setup Circos config
     circos_config = CircosConfig(
         ref_gbk=ref_gbk,
         outdir=outdir,
         ticks_labelsize=ticks_labelsize,
+        gc_window_size=gc_window_size,
+        gc_step_size=gc_step_size,
+        lod_pixel_width=lod_pixel_width,
+        full_detail=full_detail,
         # Radius
         forward_cds_r=forward_cds_r,
         reverse_cds_r=reverse_cds_r,
@@ -128,47 +284,284 @@ def run(
         gc_content_n_color=gc_content_n_color,
         gc_skew_p_color=gc_skew_p_color,
         gc_skew_n_color=gc_skew_n_color,
+        # COG classification color of CDS
+        cds_colors=cds_colors,
     )
-    for rbh_result_file in rbh_result_files:
-        circos_config.add_conserved_cds_config(rbh_result_file)
-    circos_config.write_config_file()
+    with profiler.stage("circos_config"):
+        for rbh_result_file in rbh_result_files:
+            circos_config.add_conserved_cds_config(rbh_result_file)
+        circos_config.write_config_file()
 
-    # Run COGclassifier for Functional Classification of Reference CDSs
-    if assign_cog_color:
-        cog_dir = outdir / "cogclassifier"
-        cog_classifier_result_file = cog_dir / "classifier_result.tsv"
-        em_print("Run COGclassifier for Functional Classification of Reference CDSs")
-        if force or not cog_classifier_result_file.exists():
-            cogclassifier.run(
-                ref_faa_file, cog_dir, thread_num=thread_num, evalue=cog_evalue
-            )
-        else:
-            print("# Reuse previous COGclassifier result")
+    # Run Circos
+    if not skip_circos:
+        with profiler.stage("circos"):
+            run_circos(circos_config.config_file, renderer)
 
-        # Assign COG color to reference CDS
-        if cog_color_json is not None:
-            with open(cog_color_json) as f:
-                config.cog_letter2color = json.load(f)
-        location_id2color = get_location_id2color(
-            cog_classifier_result_file, config.cog_letter2color
+    # Plot legend for Circos result
+    circos_legend_dir = outdir / "circos_legend"
+    legend_cache = shared_cache
+    if legend_cache is None and legend_cache_dir is not None:
+        legend_cache = SharedCache(legend_cache_dir)
+    with profiler.stage("circos_legend"):
+        CircosLegend(
+            circos_config,
+            config.cog_letter2color,
+            config.cog_letter2desc,
+            circos_legend_dir,
+            shared_cache=legend_cache,
+        ).plot_all_legends(processes=thread_num)
+    profiler.write_report()
+
+    return circos_config.config_file
+
+
+def run_cogclassifier(
+    query_fasta_file: Path,
+    outdir: Path,
+    thread_num: int,
+    evalue: float,
+    lock: Optional[Any] = None,
+) -> None:
+    """Run COGclassifier
+
+    COGclassifier unpacks its database files into shared cache directory on
+    every run, so concurrent runs must be serialized by `lock`.
+
+    Args:
+        query_fasta_file (Path): Query CDS fasta file
+        outdir (Path): Output directory
+        thread_num (int): Number of threads
+        evalue (float): E-value parameter
+        lock (Optional[Any]): Lock to serialize concurrent runs
+    """
+    from cogclassifier import cogclassifier
+
+    with nullcontext() if lock is None else lock:
+        cogclassifier.run(
+            query_fasta_file, outdir, thread_num=thread_num, evalue=evalue
         )
-        rewrite_circos_cds_color(circos_config.f_cds_file, location_id2color)
-        rewrite_circos_cds_color(circos_config.r_cds_file, location_id2color)
 
-    # Run Circos
+
+def run_circos(circos_config_file: Path, renderer: str = "circos") -> bool:
+    """Run Circos
+
+    Args:
+        circos_config_file (Path): Circos config file
+        renderer (str, optional): Renderer ('circos' or 'matplotlib')
+
+    Returns:
+        bool: True if Circos run successfully, otherwise False
+    """
+    if renderer == "matplotlib":
+        em_print("Run Circos (Built-in matplotlib renderer)")
+        from mgcplotter.circos_renderer import CircosRenderer
+
+        try:
+            CircosRenderer(circos_config_file).render()
+        except Exception as e:
+            print(f"# Failed to render Circos plot ({type(e).__name__}: {e})")
+            return False
+        return True
+
     em_print("Run Circos")
-    cmd = f"circos -conf {circos_config.config_file}"
+    cmd = f"circos -conf {circos_config_file}"
     print(f"$ {cmd}\n")
-    sp.run(cmd, shell=True)
+    return run_command(cmd) == 0
 
-    # Plot legend for Circos result
-    circos_legend_dir = outdir / "circos_legend"
-    CircosLegend(
-        circos_config,
-        config.cog_letter2color,
-        config.cog_letter2desc,
-        circos_legend_dir,
-    ).plot_all_legends()
+
+def run_batch(
+    jobs: List[BatchJob],
+    batch_job_num: int = 1,
+    batch_circos_job_num: int = 1,
+    **kwargs,
+) -> List[str]:
+    """Run MGCplotter workflow for multiple reference genomes in one process
+
+    Genbank parsing, RBH search, COGclassifier & Circos config generation are run
+    in `batch_job_num` worker processes (Threads are split among workers).
+    Circos plots are run in a separate pool of `batch_circos_job_num` jobs as soon
+    as each config is generated. Legends with same contents are rendered only once
+    (and copied from cache directory).
+
+    Args:
+        jobs (List[BatchJob]): Batch jobs
+        batch_job_num (int, optional): Number of worker processes
+        batch_circos_job_num (int, optional): Max number of concurrent Circos runs
+        **kwargs: Common `run()` arguments. Each job output is '{outdir}/{name}'
+
+    Returns:
+        List[str]: Failed job names
+    """
+    outdir: Path = kwargs.pop("outdir")
+    outdir.mkdir(exist_ok=True)
+    for k in ("ref_file", "query_files", "skip_circos"):
+        kwargs.pop(k, None)
+    renderer = kwargs.get("renderer", "circos")
+    batch_job_num = max(min(batch_job_num, len(jobs)), 1)
+    kwargs["thread_num"] = max(kwargs.get("thread_num", 1) // batch_job_num, 1)
+
+    em_print(f"Run {len(jobs)} Batch Jobs ({batch_job_num} Workers)")
+    failed_job_names: List[str] = []
+    name2circos_future: Dict[str, Future] = {}
+    mp_context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(batch_job_num, mp_context=mp_context)
+    circos_executor = ThreadPoolExecutor(batch_circos_job_num)
+    legend_cache_tmpdir = tempfile.TemporaryDirectory()
+    kwargs["legend_cache_dir"] = Path(legend_cache_tmpdir.name)
+    # COGclassifier runs of workers are serialized (Shared database directory)
+    cog_manager = mp_context.Manager() if kwargs.get("assign_cog_color") else None
+    with executor, circos_executor, legend_cache_tmpdir, cog_manager or nullcontext():
+        if cog_manager is not None:
+            kwargs["cog_lock"] = cog_manager.Lock()
+        future2name = {
+            executor.submit(
+                run,
+                ref_file=job.ref_file,
+                outdir=outdir / job.name,
+                query_files=job.query_files,
+                skip_circos=True,
+                **kwargs,
+            ): job.name
+            for job in jobs
+        }
+        for future in as_completed(future2name):
+            name = future2name[future]
+            try:
+                circos_config_file = future.result()
+            except Exception as e:
+                print(f"# Failed batch job '{name}' ({type(e).__name__}: {e})")
+                failed_job_names.append(name)
+                continue
+            print(f"# Finished batch job config setup '{name}'")
+            name2circos_future[name] = circos_executor.submit(
+                run_circos, circos_config_file, renderer
+            )
+        for name, circos_future in name2circos_future.items():
+            if not circos_future.result():
+                print(f"# Failed batch job Circos run '{name}'")
+                failed_job_names.append(name)
+    return [job.name for job in jobs if job.name in failed_job_names]
+
+
+def run_panel(
+    panel_files: List[Path],
+    batch_job_num: int = 1,
+    batch_circos_job_num: int = 1,
+    **kwargs,
+) -> List[str]:
+    """Run all-vs-all panel workflow (Each genome is plotted against all others)
+
+    MMseqs RBH search is run only once for each unordered genome pair,
+    and results are stored in shared panel RBH table ('{outdir}/panel_rbh').
+    RBH results of each reference are derived from the table, and then
+    each reference is plotted by batch workflow ('{outdir}/{name}').
+
+    Args:
+        panel_files (List[Path]): Panel genome genbank files
+        batch_job_num (int, optional): Number of worker processes
+        batch_circos_job_num (int, optional): Max number of concurrent Circos runs
+        **kwargs: Common `run()` arguments
+
+    Returns:
+        List[str]: Failed job names
+    """
+    outdir: Path = kwargs["outdir"]
+    thread_num: int = kwargs.get("thread_num", 1)
+    job_num: int = kwargs.get("job_num", 1)
+    mmseqs_evalue: float = kwargs.get("mmseqs_evalue", 1e-3)
+    force: bool = kwargs.get("force", False)
+    panel_dir = outdir / "panel_rbh"
+    panel_dir.mkdir(parents=True, exist_ok=True)
+    add_bin_path()
+    shared_cache = None
+    if kwargs.get("cache_dir") is not None:
+        cache_max_size = kwargs.get("cache_max_size", 1024) * 1024**2
+        shared_cache = SharedCache(kwargs["cache_dir"], max_size=cache_max_size)
+    cache = ResultCache(panel_dir / "cache_manifest.json", shared_cache)
+
+    from mgcplotter.genbank import Genbank
+    from mgcplotter.panel import PanelRbhTable
+
+    # Setup panel genome CDS faa files
+    names = [f.with_suffix("").name for f in panel_files]
+    name2faa_file: Dict[str, Path] = {}
+    for name, panel_file in zip(names, panel_files):
+        faa_file = panel_dir / f"{name}.faa"
+        faa_key = cache.make_key(panel_file, __version__)
+        if force or not cache.load(faa_file, faa_key):
+            Genbank(panel_file, fast_parser=True).write_cds_fasta(faa_file)
+            cache.update(faa_file, faa_key)
+        name2faa_file[name] = faa_file
+
+    # Run MMseqs RBH search for each unordered genome pair
+    pairs = list(itertools.combinations(names, 2))
+    em_print(f"Search Conserved CDS ({len(pairs)} Panel Genome Pairs)")
+    pair2rbh_result_file: Dict[Tuple[str, str], Path] = {}
+    pair2rbh_key: Dict[Tuple[str, str], str] = {}
+    for name_a, name_b in pairs:
+        rbh_result_file = panel_dir / f"{name_a}_vs_{name_b}_rbh.tsv"
+        faa_a, faa_b = name2faa_file[name_a], name2faa_file[name_b]
+        rbh_key = get_rbh_cache_key(cache, faa_a, faa_b, mmseqs_evalue)
+        pair2rbh_result_file[(name_a, name_b)] = rbh_result_file
+        if force or not cache.load(rbh_result_file, rbh_key):
+            print(f"# Run MMseqs RBH search ({name_a} vs {name_b})")
+            pair2rbh_key[(name_a, name_b)] = rbh_key
+        else:
+            print(f"# Reuse previous MMseqs RBH search result ({name_a} vs {name_b})")
+    if len(pair2rbh_key) > 0:
+        job_num = max(min(job_num, thread_num, len(pair2rbh_key)), 1)
+        job_thread_num = max(thread_num // job_num, 1)
+        with ThreadPoolExecutor(max_workers=job_num) as executor:
+            futures = [
+                executor.submit(
+                    run_mmseqs_rbh_search,
+                    name2faa_file[name_a],
+                    name2faa_file[name_b],
+                    pair2rbh_result_file[(name_a, name_b)],
+                    mmseqs_evalue,
+                    job_thread_num,
+                )
+                for name_a, name_b in pair2rbh_key.keys()
+            ]
+            for future in futures:
+                future.result()
+        for pair, rbh_key in pair2rbh_key.items():
+            if pair2rbh_result_file[pair].exists():
+                cache.update(pair2rbh_result_file[pair], rbh_key)
+
+    # Write shared panel RBH table & derive RBH results of each reference
+    # Query CDS faa files are also reused (Not re-parsed in each reference run)
+    panel_rbh_table = PanelRbhTable.from_rbh_result_files(pair2rbh_result_file)
+    panel_rbh_table.write(panel_dir / "panel_rbh_table.tsv")
+    for ref_name in names:
+        rbh_dir = outdir / ref_name / "rbh_search"
+        rbh_dir.mkdir(parents=True, exist_ok=True)
+        ref_cache = ResultCache(outdir / ref_name / "cache_manifest.json")
+        for query_name, query_file in zip(names, panel_files):
+            if query_name == ref_name:
+                continue
+            query_faa_file = rbh_dir / f"{query_name}.faa"
+            shutil.copy(name2faa_file[query_name], query_faa_file)
+            query_faa_key = ref_cache.make_key(query_file, __version__)
+            ref_cache.update(query_faa_file, query_faa_key, share=False)
+            rbh_result_file = rbh_dir / f"{query_name}_vs_reference_rbh.tsv"
+            panel_rbh_table.write_rbh_result(query_name, ref_name, rbh_result_file)
+            rbh_key = get_rbh_cache_key(
+                ref_cache,
+                name2faa_file[query_name],
+                name2faa_file[ref_name],
+                mmseqs_evalue,
+            )
+            ref_cache.update(rbh_result_file, rbh_key, share=False)
+
+    # Plot each reference against all other genomes
+    # Derived RBH results are reused even if forced (Validated by cache key)
+    kwargs["reuse_rbh_results"] = True
+    jobs = [
+        BatchJob(name, panel_file, [f for f in panel_files if f != panel_file])
+        for name, panel_file in zip(names, panel_files)
+    ]
+    return run_batch(jobs, batch_job_num, batch_circos_job_num, **kwargs)
 
 
 def add_bin_path() -> None:
@@ -202,51 +595,199 @@ def run_mmseqs_rbh_search(
             + f"{tmpdir} -e {evalue} --threads {thread_num} -v 0"
         )
         print(f"$ {cmd}\n")
-        sp.run(cmd, shell=True)
+        run_command(cmd)
 
 
-def get_location_id2color(
-    cog_classifier_result_file: Path,
-    cog_letter2color: Dict[str, str],
-) -> Dict[str, str]:
-    """Get CDS location ID & Color dict
+def get_rbh_cache_key(
+    cache: ResultCache,
+    query_fasta_file: Path,
+    ref_fasta_file: Path,
+    evalue: float,
+) -> str:
+    """Get MMseqs RBH search result cache key
 
     Args:
-        cog_classifier_result_file (Path): COGclassifier result file
-        cog_letter2color (Dict[str, str]): COG letter & Color dict
+        cache (ResultCache): Result cache
+        query_fasta_file (Path): Query fasta file
+        ref_fasta_file (Path): Reference fasta file
+        evalue (float): E-value
 
     Returns:
-        Dict[str, str]: CDS location ID & COG Color dict
+        str: Cache key
+    """
+    return cache.make_key(
+        query_fasta_file, ref_fasta_file, evalue, get_mmseqs_version()
+    )
+
+
+@lru_cache(maxsize=None)
+def get_mmseqs_version() -> str:
+    """Get MMseqs version (Empty string if version is not available)
 
-    Notes:
-        CDS location ID = "start end strand" (e.g. "300 1000 +")
+    Returns:
+        str: MMseqs version
     """
-    df = pd.read_csv(cog_classifier_result_file, delimiter="\t")
-    location_id2color = defaultdict(str)
-    for query_id, cog_letter in zip(df["QUERY_ID"], df["COG_LETTER"]):
-        location_id = query_id.split("|")[1].replace("_", " ")
-        location_id2color[location_id] = cog_letter2color[cog_letter]
-    return location_id2color
+    res = sp.run("mmseqs version", shell=True, capture_output=True, text=True)
+    return res.stdout.strip() if res.returncode == 0 else ""
+
+
+def create_mmseqs_ref_db(
+    ref_fasta_file: Path,
+    ref_db_dir: Path,
+    thread_num: int = 1,
+) -> Path:
+    """Create MMseqs reference database & index (createdb, createindex)
 
+    Database is cached in `ref_db_dir` keyed by reference fasta content hash,
+    and reused while reference fasta contents are unchanged.
 
-def rewrite_circos_cds_color(
-    circos_cds_file: Path, location_id2color: Dict[str, str]
+    Args:
+        ref_fasta_file (Path): Reference fasta file
+        ref_db_dir (Path): Reference database cache directory
+        thread_num (int, optional): Thread number
+
+    Returns:
+        Path: MMseqs reference database path
+    """
+    ref_hash = file_hash(ref_fasta_file)[:16]
+    db_dir = ref_db_dir / ref_hash
+    ref_db = db_dir / "reference"
+    done_file = db_dir / "done"
+    if done_file.exists():
+        print("# Reuse previous MMseqs reference database")
+        return ref_db
+
+    # Remove database of previous (changed) reference
+    shutil.rmtree(ref_db_dir, ignore_errors=True)
+    db_dir.mkdir(parents=True)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cmds = [
+            f"mmseqs createdb {ref_fasta_file} {ref_db} -v 0",
+            f"mmseqs createindex {ref_db} {tmpdir} --threads {thread_num} -v 0",
+        ]
+        for cmd in cmds:
+            print(f"$ {cmd}\n")
+            run_command(cmd, check=True)
+    done_file.touch()
+    return ref_db
+
+
+def run_mmseqs_rbh_search_with_db(
+    query_fasta_file: Path,
+    ref_db: Path,
+    rbh_result_file: Path,
+    evalue: float = 1e-3,
+    thread_num: int = 1,
 ) -> None:
-    """Rewrite Circos CDS color to COG classification color
+    """Run MMseqs rbh search against prebuilt reference database
+
+    Same steps as `mmseqs easy-rbh` (createdb, rbh, convertalis),
+    except that reference database creation is skipped.
 
     Args:
-        circos_cds_file (Path): Circos CDS file
-        location_id2color (Dict[str, str]): CDS location ID & COG Color dict
+        query_fasta_file (Path): Query fasta file
+        ref_db (Path): MMseqs reference database
+        rbh_result_file (Path): RBH result file
+        evalue (float, optional): E-value
+        thread_num (int, optional): Thread number
     """
-    contents = ""
-    with open(circos_cds_file) as f:
-        for line in f.read().splitlines():
-            location_id = " ".join(line.split(" ")[1:4])
-            color = location_id2color.get(location_id, config.cog_letter2color["-"])
-            hexcolor = mpl.colors.to_hex(color).lstrip("#")
-            contents += " ".join(line.split(" ")[0:4]) + f" color={hexcolor}\n"
-    with open(circos_cds_file, "w") as f:
-        f.write(contents)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        query_db = Path(tmpdir) / "query"
+        rbh_db = Path(tmpdir) / "rbh"
+        cmds = [
+            f"mmseqs createdb {query_fasta_file} {query_db} -v 0",
+            f"mmseqs rbh {query_db} {ref_db} {rbh_db} {Path(tmpdir) / 'tmp'} "
+            + f"-e {evalue} --threads {thread_num} -v 0",
+            f"mmseqs convertalis {query_db} {ref_db} {rbh_db} {rbh_result_file} "
+            + f"--threads {thread_num} -v 0",
+        ]
+        for cmd in cmds:
+            print(f"$ {cmd}\n")
+            run_command(cmd)
+
+
+def run_mmseqs_rbh_searches(
+    query_fasta_files: List[Path],
+    ref_fasta_file: Path,
+    rbh_result_files: List[Path],
+    evalue: float = 1e-3,
+    thread_num: int = 1,
+    job_num: int = 1,
+    ref_db_dir: Optional[Path] = None,
+    profiler: Optional[StageProfiler] = None,
+) -> None:
+    """Run multiple MMseqs rbh searches in parallel
+
+    Threads are split among concurrent jobs, so that total threads
+    do not exceed `thread_num` (e.g. 8 threads & 3 jobs => 2 threads per job).
+    If `ref_db_dir` is set, reference database is created only once
+    and reused for all queries. Otherwise, `mmseqs easy-rbh` is run for each query.
+
+    Args:
+        query_fasta_files (List[Path]): Query fasta files
+        ref_fasta_file (Path): Reference fasta file
+        rbh_result_files (List[Path]): RBH result files (Same order as query)
+        evalue (float, optional): E-value
+        thread_num (int, optional): Total thread number
+        job_num (int, optional): Max number of concurrent search jobs
+        ref_db_dir (Optional[Path], optional): Reference database cache directory
+        profiler (Optional[StageProfiler], optional): Profiler of each search stage
+    """
+    if len(query_fasta_files) == 0:
+        return
+    if profiler is None:
+        profiler = StageProfiler("", enabled=False)
+    if ref_db_dir is None:
+        search_func, ref = run_mmseqs_rbh_search, ref_fasta_file
+    else:
+        with profiler.stage("mmseqs_reference_db"):
+            ref = create_mmseqs_ref_db(ref_fasta_file, ref_db_dir, thread_num)
+        search_func = run_mmseqs_rbh_search_with_db
+    job_num = max(min(job_num, thread_num, len(query_fasta_files)), 1)
+    job_thread_num = max(thread_num // job_num, 1)
+    with ThreadPoolExecutor(max_workers=job_num) as executor:
+        futures = [
+            executor.submit(
+                profiler.wrap(f"mmseqs_rbh:{query_fasta_file.stem}", search_func),
+                query_fasta_file,
+                ref,
+                rbh_result_file,
+                evalue,
+                job_thread_num,
+            )
+            for query_fasta_file, rbh_result_file in zip(
+                query_fasta_files, rbh_result_files
+            )
+        ]
+        for future in futures:
+            future.result()
+
+
+def get_cds_colors(
+    cog_classifier_result_file: Path,
+    cog_letter2color: Dict[str, str],
+    cds_num: int,
+) -> List[str]:
+    """Get COG color of each reference CDS
+
+    Args:
+        cog_classifier_result_file (Path): COGclassifier result file
+        cog_letter2color (Dict[str, str]): COG letter & Color dict
+        cds_num (int): Number of reference CDSs
+
+    Returns:
+        List[str]: COG color of each CDS index (Not classified CDS is '-' color)
+    """
+    import numpy as np
+    import pandas as pd
+
+    from mgcplotter.genbank import Genbank
+
+    df = pd.read_csv(cog_classifier_result_file, delimiter="\t")
+    cds_colors = np.full(cds_num, cog_letter2color["-"], dtype=object)
+    cds_idxs = Genbank.parse_cds_idxs(df["QUERY_ID"])
+    cds_colors[cds_idxs] = [cog_letter2color[letter] for letter in df["COG_LETTER"]]
+    return cds_colors.tolist()
 
 
 def em_print(content: str) -> None:
@@ -288,9 +829,9 @@ def get_args() -> argparse.Namespace:
     general_opts.add_argument(
         "-r",
         "--ref_file",
-        required=True,
         type=Path,
         help="Reference genome genbank file (*.gb|*.gbk|*.gbff)",
+        default=None,
         metavar="R",
     )
     general_opts.add_argument(
@@ -336,6 +877,52 @@ def get_args() -> argparse.Namespace:
         default=default_thread_num,
         metavar="",
     )
+    default_job_num = 1
+    general_opts.add_argument(
+        "-j",
+        "--job_num",
+        type=int,
+        help=f"Parallel MMseqs RBH search jobs number (Default: {default_job_num})",
+        default=default_job_num,
+        metavar="",
+    )
+    general_opts.add_argument(
+        "--cache_dir",
+        type=Path,
+        help="Shared cache directory of query CDS, RBH results & legends across runs",
+        default=None,
+        metavar="",
+    )
+    default_cache_max_size = 1024
+    general_opts.add_argument(
+        "--cache_max_size",
+        type=int,
+        help=f"Max shared cache size [MB] (Default: {default_cache_max_size})",
+        default=default_cache_max_size,
+        metavar="",
+    )
+    renderers = ["circos", "matplotlib"]
+    general_opts.add_argument(
+        "--renderer",
+        type=str,
+        help="Circos plot renderer (Built-in 'matplotlib' renderer does not "
+        + f"require Circos) [{'|'.join(renderers)}] (Default: '{renderers[0]}')",
+        default=renderers[0],
+        choices=renderers,
+        metavar="",
+    )
+    general_opts.add_argument(
+        "--profile",
+        help="Write per stage time & memory report to '{outdir}/profile' "
+        + "(Default: OFF)",
+        action="store_true",
+    )
+    general_opts.add_argument(
+        "--profile_detail",
+        help="Also dump cProfile stats & tracemalloc peak of in-process stages "
+        + "(Default: OFF)",
+        action="store_true",
+    )
     general_opts.add_argument(
         "-f",
         "--force",
@@ -356,6 +943,40 @@ def get_args() -> argparse.Namespace:
         action="help",
     )
 
+    # Batch Options
+    batch_opts = parser.add_argument_group("Batch Options")
+    batch_opts.add_argument(
+        "--batch_manifest",
+        type=Path,
+        help="Batch manifest TSV file (name, ref_file, comma separated query_files)",
+        default=None,
+        metavar="",
+    )
+    batch_opts.add_argument(
+        "--panel_files",
+        nargs="+",
+        type=Path,
+        help="Panel genome genbank files (Each genome is plotted against all others)",
+        default=[],
+        metavar="",
+    )
+    default_batch_job_num = 1
+    batch_opts.add_argument(
+        "--batch_job_num",
+        type=int,
+        help=f"Batch worker processes number (Default: {default_batch_job_num})",
+        default=default_batch_job_num,
+        metavar="",
+    )
+    default_batch_circos_job_num = 1
+    batch_opts.add_argument(
+        "--batch_circos_job_num",
+        type=int,
+        help=f"Batch parallel Circos runs (Default: {default_batch_circos_job_num})",
+        default=default_batch_circos_job_num,
+        metavar="",
+    )
+
     # Graph Size Options
     size_opts = parser.add_argument_group("Graph Size Options")
     default_ticks_labelsize = 35
@@ -366,6 +987,34 @@ def get_args() -> argparse.Namespace:
         default=default_ticks_labelsize,
         metavar="",
     )
+    size_opts.add_argument(
+        "--gc_window_size",
+        type=int,
+        help="GC content & GC skew window size [bp] (Default: Auto)",
+        default=None,
+        metavar="",
+    )
+    size_opts.add_argument(
+        "--gc_step_size",
+        type=int,
+        help="GC content & GC skew step size [bp] (Default: Auto)",
+        default=None,
+        metavar="",
+    )
+    default_lod_pixel_width = 1.0
+    size_opts.add_argument(
+        "--lod_pixel_width",
+        type=float,
+        help="Merge adjacent same color features narrower than this pixel width "
+        + f"(Default: {default_lod_pixel_width})",
+        default=default_lod_pixel_width,
+        metavar="",
+    )
+    size_opts.add_argument(
+        "--full_detail",
+        help="Plot all features without merging narrow features (Default: OFF)",
+        action="store_true",
+    )
     for k, v in config.radius_args_dict.items():
         # Track radius control arguments
         size_opts.add_argument(
@@ -403,11 +1052,63 @@ def get_args() -> argparse.Namespace:
 
     # Argument value validation check
     err_info = ""
-    if not args.ref_file.exists():
-        err_info += f"-r/--ref_file: File not found '{args.ref_file}'\n"
+    if args.batch_manifest is None and len(args.panel_files) == 0:
+        if args.ref_file is None:
+            err_info += "-r/--ref_file: Required (or --batch_manifest, --panel_files)\n"
+        elif not args.ref_file.exists():
+            err_info += f"-r/--ref_file: File not found '{args.ref_file}'\n"
+    elif args.ref_file is not None or len(args.query_files) > 0:
+        err_info += (
+            "--batch_manifest/--panel_files: "
+            + "Not allowed with -r/--ref_file, --query_files\n"
+        )
+    elif args.batch_manifest is not None and len(args.panel_files) > 0:
+        err_info += "--batch_manifest: Not allowed with --panel_files\n"
+    elif len(args.panel_files) > 0:
+        panel_names = [f.with_suffix("").name for f in args.panel_files]
+        if len(args.panel_files) < 2:
+            err_info += "--panel_files: At least 2 genome files are required\n"
+        if len(panel_names) != len(set(panel_names)):
+            err_info += "--panel_files: Duplicated file names\n"
+        if "panel_rbh" in panel_names:
+            err_info += "--panel_files: 'panel_rbh' is reserved file name\n"
+        for f in args.panel_files:
+            if not f.exists():
+                err_info += f"--panel_files: File not found '{f}'\n"
+            elif f.suffix not in config.gbk_suffixs:
+                err_info += f"--panel_files: '{f.suffix}' is invalid file suffix\n"
+    elif not args.batch_manifest.exists():
+        err_info += f"--batch_manifest: File not found '{args.batch_manifest}'\n"
+    else:
+        try:
+            load_batch_manifest(args.batch_manifest)
+        except ValueError as e:
+            err_info += f"--batch_manifest: Invalid manifest\n{e}"
+    for k in ("batch_job_num", "batch_circos_job_num"):
+        if getattr(args, k) < 1:
+            err_info += f"--{k}: '{getattr(args, k)}' is invalid value (value >= 1)\n"
+    for k in ("gc_window_size", "gc_step_size"):
+        if getattr(args, k) is not None and getattr(args, k) < 1:
+            err_info += f"--{k}: '{getattr(args, k)}' is invalid value (value >= 1)\n"
     for f in args.query_files:
         if f.suffix not in config.valid_query_suffixs:
             err_info += f"'{f.suffix}' is invalid file suffix ({f.name})\n"
+    query_names = [f.with_suffix("").name for f in args.query_files]
+    if len(query_names) != len(set(query_names)):
+        err_info += "--query_files: Duplicated file names\n"
+    if args.lod_pixel_width < 0:
+        err_info += (
+            f"--lod_pixel_width: '{args.lod_pixel_width}' is invalid value "
+            + "(value >= 0)\n"
+        )
+    if args.job_num < 1:
+        err_info += f"-j/--job_num: '{args.job_num}' is invalid value (value >= 1)\n"
+    if args.cache_max_size < 1:
+        err_info += (
+            f"--cache_max_size: '{args.cache_max_size}' is invalid value (value >= 1)\n"
+        )
+    import matplotlib as mpl
+
     for k, v in args.__dict__.items():
         if k in config.color_args_dict.keys():
             if not mpl.colors.is_color_like(v):
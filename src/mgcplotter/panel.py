@@ -0,0 +1,119 @@
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+rbh_columns = (
+    "QUERY,TARGET,FIDENT,ALNLEN,MISMATCH,GAPOPEN,QSTART,QEND,TSTART,TEND,EVALUE,BITS"
+).split(",")
+# Column order of reversed (target vs query) RBH result
+reversed_rbh_columns = (
+    "TARGET,QUERY,FIDENT,ALNLEN,MISMATCH,GAPOPEN,TSTART,TEND,QSTART,QEND,EVALUE,BITS"
+).split(",")
+
+
+class PanelRbhTable:
+    """All-vs-all panel RBH pair table
+
+    MMseqs RBH result of each unordered genome pair (A, B) is stored only once
+    (A: query, B: target). RBH result of B vs A is derived by swapping
+    query & target columns. Values are kept as original strings.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """Constructor
+
+        Args:
+            df (pd.DataFrame): Table dataframe (GENOME_A, GENOME_B, RBH columns)
+        """
+        self.df = df
+        self._pair2df: Optional[Dict[Tuple[str, str], pd.DataFrame]] = None
+
+    @staticmethod
+    def from_rbh_result_files(
+        pair2rbh_result_file: Dict[Tuple[str, str], Path],
+    ) -> "PanelRbhTable":
+        """Build table from MMseqs RBH result files
+
+        Args:
+            pair2rbh_result_file (Dict[Tuple[str, str], Path]): (A, B) & RBH result
+
+        Returns:
+            PanelRbhTable: Panel RBH table
+        """
+        dfs = []
+        for (genome_a, genome_b), rbh_result_file in pair2rbh_result_file.items():
+            df = PanelRbhTable._load_rbh_result(rbh_result_file)
+            df.insert(0, "GENOME_A", genome_a)
+            df.insert(1, "GENOME_B", genome_b)
+            dfs.append(df)
+        columns = ["GENOME_A", "GENOME_B"] + rbh_columns
+        return PanelRbhTable(pd.concat([pd.DataFrame(columns=columns)] + dfs))
+
+    @staticmethod
+    def load(table_file: Union[str, Path]) -> "PanelRbhTable":
+        """Load panel RBH table file
+
+        Args:
+            table_file (Union[str, Path]): Panel RBH table file
+
+        Returns:
+            PanelRbhTable: Panel RBH table
+        """
+        return PanelRbhTable(pd.read_table(table_file, dtype=str))
+
+    def write(self, table_file: Union[str, Path]) -> None:
+        """Write panel RBH table file
+
+        Args:
+            table_file (Union[str, Path]): Output panel RBH table file
+        """
+        self.df.to_csv(table_file, sep="\t", index=False)
+
+    def get_rbh_result(self, query_name: str, ref_name: str) -> pd.DataFrame:
+        """Get RBH result of query genome vs reference genome
+
+        Args:
+            query_name (str): Query genome name
+            ref_name (str): Reference genome name
+
+        Returns:
+            pd.DataFrame: RBH result (Same columns as MMseqs RBH result)
+        """
+        pair2df = self._get_pair2df()
+        forward_df = pair2df.get((query_name, ref_name))
+        if forward_df is not None:
+            return forward_df[rbh_columns]
+        reverse_df = pair2df.get((ref_name, query_name))
+        if reverse_df is None:
+            return pd.DataFrame(columns=rbh_columns)
+        rbh_df = reverse_df[reversed_rbh_columns]
+        rbh_df.columns = rbh_columns
+        return rbh_df
+
+    def write_rbh_result(
+        self, query_name: str, ref_name: str, rbh_result_file: Union[str, Path]
+    ) -> None:
+        """Write RBH result of query genome vs reference genome (MMseqs format)
+
+        Args:
+            query_name (str): Query genome name
+            ref_name (str): Reference genome name
+            rbh_result_file (Union[str, Path]): Output RBH result file
+        """
+        rbh_df = self.get_rbh_result(query_name, ref_name)
+        rbh_df.to_csv(rbh_result_file, sep="\t", header=False, index=False)
+
+    def _get_pair2df(self) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """Genome pair (A, B) & RBH result dataframe (Grouped only once)"""
+        if self._pair2df is None:
+            groups = self.df.groupby(["GENOME_A", "GENOME_B"], sort=False)
+            self._pair2df = {pair: df for pair, df in groups}
+        return self._pair2df
+
+    @staticmethod
+    def _load_rbh_result(rbh_result_file: Path) -> pd.DataFrame:
+        """Load MMseqs RBH result file as string values"""
+        if rbh_result_file.stat().st_size == 0:
+            return pd.DataFrame(columns=rbh_columns)
+        return pd.read_table(rbh_result_file, header=None, names=rbh_columns, dtype=str)
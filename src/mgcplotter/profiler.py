@@ -0,0 +1,400 @@
+import cProfile
+import ctypes
+import json
+import os
+import platform
+import resource
+import subprocess as sp
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+
+@dataclass
+class StageRecord:
+    """Stage Profile Record DataClass
+
+    CPU times include waited child processes (e.g. MMseqs, Circos).
+    Peak RSS & RSS delta are own process values during stage.
+    Max RSS is process lifetime high-water mark at the end of stage
+    (Never decreases across stages).
+    Children peak RSS is max RSS of child processes run by `run_command()` in
+    stage (e.g. MMseqs, Circos). Other child processes (e.g. COGclassifier
+    internal commands, legend worker processes) are not counted.
+    """
+
+    name: str
+    start: float
+    wall_time: float
+    cpu_time: float
+    children_cpu_time: float
+    max_rss_mb: float
+    peak_rss_mb: float
+    rss_delta_mb: float
+    children_peak_rss_mb: float
+    tracemalloc_peak_mb: Optional[float] = None
+
+
+class StageProfiler:
+    """Workflow Stage Profiler
+
+    Wall time, CPU time & peak RSS of each stage are recorded and written as JSON
+    report. If `detail=True`, cProfile stats of each in-process stage are dumped
+    and tracemalloc peak memory is recorded. Stages may run concurrently in
+    threads (e.g. COGclassifier), in which case CPU times & tracemalloc peaks
+    of overlapping stages are process-wide values.
+    """
+
+    def __init__(
+        self,
+        outdir: Union[str, Path],
+        enabled: bool = True,
+        detail: bool = False,
+    ):
+        """Constructor
+
+        Args:
+            outdir (Union[str, Path]): Profile output directory
+            enabled (bool, optional): If False, nothing is recorded
+            detail (bool, optional): Dump cProfile stats & record tracemalloc peak
+        """
+        self.outdir = Path(outdir)
+        self.enabled = enabled or detail
+        self.detail = detail
+        self.records: List[StageRecord] = []
+        self._start_time = time.perf_counter()
+        self._lock = threading.Lock()
+        self._tracemalloc_started = False
+        self._rss_monitor = PeakRssMonitor() if self.enabled else None
+        if self.detail and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc_started = True
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile stage in `with` block
+
+        Args:
+            name (str): Stage name (Used as cProfile stats filename)
+        """
+        if not self.enabled:
+            yield
+            return
+        profile = None
+        if self.detail:
+            if hasattr(tracemalloc, "reset_peak"):  # Python >= 3.9
+                tracemalloc.reset_peak()
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is active in concurrent stage (Python >= 3.12)
+                profile = None
+        start_time = time.perf_counter()
+        start_self, start_children = self._rusage()
+        start_rss_mb = self._rss_monitor.rss_mb()
+        monitor_id = self._rss_monitor.start()
+        command_max_rss_list = [0]
+        _get_active_stages().append(command_max_rss_list)
+        try:
+            yield
+        finally:
+            _get_active_stages().remove(command_max_rss_list)
+            end_time = time.perf_counter()
+            end_self, end_children = self._rusage()
+            peak_rss_mb = self._rss_monitor.stop(monitor_id)
+            end_rss_mb = self._rss_monitor.rss_mb()
+            tracemalloc_peak_mb = None
+            if profile is not None:
+                profile.disable()
+                self.outdir.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(self.outdir / f"{self._filename(name)}.prof")
+            if self.detail:
+                peak_mb = tracemalloc.get_traced_memory()[1] / 1024**2
+                tracemalloc_peak_mb = round(peak_mb, 3)
+            record = StageRecord(
+                name=name,
+                start=round(start_time - self._start_time, 6),
+                wall_time=round(end_time - start_time, 6),
+                cpu_time=round(self._cpu(end_self) - self._cpu(start_self), 6),
+                children_cpu_time=round(
+                    self._cpu(end_children) - self._cpu(start_children), 6
+                ),
+                max_rss_mb=round(self._rss_monitor.max_rss_mb, 3),
+                peak_rss_mb=round(peak_rss_mb, 3),
+                rss_delta_mb=round(end_rss_mb - start_rss_mb, 3),
+                children_peak_rss_mb=self._rss_mb(command_max_rss_list[0]),
+                tracemalloc_peak_mb=tracemalloc_peak_mb,
+            )
+            with self._lock:
+                self.records.append(record)
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap function to be profiled as stage (e.g. for background thread)
+
+        Args:
+            name (str): Stage name
+            func (Callable[..., Any]): Target function
+
+        Returns:
+            Callable[..., Any]: Wrapped function
+        """
+
+        def wrapped_func(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+
+        return wrapped_func
+
+    def write_report(self, report_file: Optional[Union[str, Path]] = None) -> None:
+        """Write profile report JSON file (and stop tracemalloc started by profiler)
+
+        Args:
+            report_file (Optional[Union[str, Path]]): Report file
+                (Default: '{outdir}/report.json')
+        """
+        if not self.enabled:
+            return
+        if report_file is None:
+            report_file = self.outdir / "report.json"
+        report_file = Path(report_file)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report = dict(
+            python=platform.python_version(),
+            pid=os.getpid(),
+            total_wall_time=round(time.perf_counter() - self._start_time, 6),
+            stages=[asdict(record) for record in self.records],
+        )
+        with open(report_file, "w") as f:
+            json.dump(report, f, indent=2)
+        if self._tracemalloc_started:
+            tracemalloc.stop()
+            self._tracemalloc_started = False
+
+    def _rusage(self):
+        """Resource usage of own process & waited child processes"""
+        return (
+            resource.getrusage(resource.RUSAGE_SELF),
+            resource.getrusage(resource.RUSAGE_CHILDREN),
+        )
+
+    def _cpu(self, rusage) -> float:
+        """User + System CPU time"""
+        return rusage.ru_utime + rusage.ru_stime
+
+    def _rss_mb(self, max_rss: int) -> float:
+        """Convert max RSS to MB (ru_maxrss is KB on Linux, Bytes on macOS)"""
+        unit = 1 if platform.system() == "Darwin" else 1024
+        return round(max_rss * unit / 1024**2, 3)
+
+    def _filename(self, name: str) -> str:
+        """Stage name to safe filename"""
+        return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+class PeakRssMonitor:
+    """Peak RSS Monitor of own process during each (possibly overlapping) stage
+
+    RSS is sampled by background thread while any stage is active (Read from
+    procfs on Linux, Mach `task_info()` on macOS, without forking child
+    processes, so children values of stages are not skewed). If process
+    max RSS (`ru_maxrss`) rises during stage, it is used as exact stage peak
+    (Short spike between samples is not missed). Process max RSS is never reset,
+    so `ru_maxrss` of other callers in same process is not affected.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        """Constructor
+
+        Args:
+            interval (float, optional): RSS sampling interval seconds
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._id2peak_mb: Dict[int, float] = {}
+        self._id2start_max_rss_mb: Dict[int, float] = {}
+        self._next_id = 0
+        self._max_rss_mb = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def max_rss_mb(self) -> float:
+        """Process lifetime max RSS (MB) (Never decreases)"""
+        with self._lock:
+            self._max_rss_mb = max(self._max_rss_mb, self._ru_max_rss_mb())
+            return self._max_rss_mb
+
+    def start(self) -> int:
+        """Start monitoring peak RSS of stage
+
+        Returns:
+            int: Monitor ID (Used in `stop()`)
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, daemon=True)
+                self._thread.start()
+            monitor_id = self._next_id
+            self._next_id += 1
+            self._id2peak_mb[monitor_id] = self.rss_mb()
+            self._id2start_max_rss_mb[monitor_id] = self._ru_max_rss_mb()
+            return monitor_id
+
+    def stop(self, monitor_id: int) -> float:
+        """Stop monitoring peak RSS of stage
+
+        Args:
+            monitor_id (int): Monitor ID returned by `start()`
+
+        Returns:
+            float: Peak RSS (MB) from start to stop
+        """
+        with self._lock:
+            # Current RSS is also taken over by other active stages, since
+            # process max RSS may lag behind after memory is freed
+            rss_mb = self.rss_mb()
+            for other_id, other_peak_mb in self._id2peak_mb.items():
+                self._id2peak_mb[other_id] = max(other_peak_mb, rss_mb)
+            peak_mb = self._id2peak_mb.pop(monitor_id)
+            max_rss_mb = self._ru_max_rss_mb()
+            if max_rss_mb > self._id2start_max_rss_mb.pop(monitor_id):
+                peak_mb = max(peak_mb, max_rss_mb)
+            self._max_rss_mb = max(self._max_rss_mb, max_rss_mb, peak_mb)
+            return peak_mb
+
+    def rss_mb(self) -> float:
+        """Current RSS (MB) of own process"""
+        if os.path.exists("/proc/self/status"):
+            return self._read_proc_status_mb("VmRSS")
+        if platform.system() == "Darwin":
+            return _darwin_rss() / 1024**2
+        # Current RSS is not available (Only process max RSS is used)
+        return 0.0
+
+    def _sample(self) -> None:
+        """Sample RSS until no stage is active"""
+        while True:
+            with self._lock:
+                if len(self._id2peak_mb) == 0:
+                    self._thread = None
+                    return
+                rss_mb = self.rss_mb()
+                for monitor_id, peak_mb in self._id2peak_mb.items():
+                    self._id2peak_mb[monitor_id] = max(peak_mb, rss_mb)
+            time.sleep(self.interval)
+
+    def _ru_max_rss_mb(self) -> float:
+        """Process max RSS (MB) (ru_maxrss is KB on Linux, Bytes on macOS)"""
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        unit = 1 if platform.system() == "Darwin" else 1024
+        return max_rss * unit / 1024**2
+
+    def _read_proc_status_mb(self, field: str) -> float:
+        """Read memory field (e.g. 'VmRSS') of '/proc/self/status' as MB"""
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+
+class _MachTaskBasicInfo(ctypes.Structure):
+    """macOS `mach_task_basic_info` struct"""
+
+    _pack_ = 4
+    _fields_ = [
+        ("virtual_size", ctypes.c_uint64),
+        ("resident_size", ctypes.c_uint64),
+        ("resident_size_max", ctypes.c_uint64),
+        ("user_time", ctypes.c_int32 * 2),
+        ("system_time", ctypes.c_int32 * 2),
+        ("policy", ctypes.c_int32),
+        ("suspend_count", ctypes.c_int32),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _darwin_libc() -> ctypes.CDLL:
+    """macOS system C library"""
+    return ctypes.CDLL("/usr/lib/libSystem.B.dylib")
+
+
+def _darwin_rss() -> int:
+    """Current RSS (Bytes) of own process on macOS (0 if not available)
+
+    Read by Mach `task_info()` without forking `ps`, so that child process
+    resource usage of stages is not affected by RSS sampling.
+    """
+    mach_task_basic_info_flavor = 20
+    info = _MachTaskBasicInfo()
+    count = ctypes.c_uint32(ctypes.sizeof(info) // 4)
+    try:
+        libc = _darwin_libc()
+        task = ctypes.c_uint32.in_dll(libc, "mach_task_self_")
+        ret = libc.task_info(
+            task,
+            mach_task_basic_info_flavor,
+            ctypes.byref(info),
+            ctypes.byref(count),
+        )
+    except (OSError, ValueError, AttributeError):
+        return 0
+    return info.resident_size if ret == 0 else 0
+
+
+_local = threading.local()
+
+
+def _get_active_stages() -> List[List[int]]:
+    """Active stages of current thread (Max RSS of commands run in each stage)"""
+    if not hasattr(_local, "stages"):
+        _local.stages = []
+    return _local.stages
+
+
+# Command wrapper process (Reports max RSS of its child processes via pipe)
+_command_wrapper = """
+import os, resource, subprocess, sys
+returncode = subprocess.run(sys.argv[1], shell=True).returncode
+max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+os.write(int(sys.argv[2]), str(max_rss).encode())
+sys.exit(returncode if returncode >= 0 else 128 - returncode)
+"""
+
+
+def run_command(cmd: str, check: bool = False) -> int:
+    """Run shell command & record its max RSS to active stages of current thread
+
+    On Linux, max RSS (`ru_maxrss`) of child process also includes high-water
+    mark of its parent process at fork & exec. So command is run via small
+    wrapper process, which reports max RSS of its own child processes.
+
+    Args:
+        cmd (str): Shell command
+        check (bool, optional): If True, raise error on non-zero return code
+
+    Returns:
+        int: Return code
+
+    Raises:
+        subprocess.CalledProcessError: Non-zero return code (if `check=True`)
+    """
+    read_fd, write_fd = os.pipe()
+    with open(read_fd, "rb") as f:
+        try:
+            wrapper_cmd = [sys.executable, "-c", _command_wrapper, cmd, str(write_fd)]
+            returncode = sp.run(wrapper_cmd, pass_fds=(write_fd,)).returncode
+        finally:
+            os.close(write_fd)
+        max_rss = int(f.read() or 0)
+    for command_max_rss_list in _get_active_stages():
+        command_max_rss_list[0] = max(command_max_rss_list[0], max_rss)
+    if check and returncode != 0:
+        raise sp.CalledProcessError(returncode, cmd)
+    return returncode
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from mgcplotter.batch import load_batch_manifest
+
+
+def test_load_batch_manifest(
+    reference_file: Path, query_gbff_dir: Path, tmp_path: Path
+):
+    """Test load batch manifest"""
+    query_files = sorted(query_gbff_dir.glob("*.gbff"))
+    manifest_file = tmp_path / "manifest.tsv"
+    manifest_file.write_text(
+        "# name\tref_file\tquery_files\n\n"
+        + f"job1\t{reference_file}\t{','.join(map(str, query_files))}\n"
+        + f"job2\t{reference_file}\n"
+    )
+    jobs = load_batch_manifest(manifest_file)
+
+    assert [job.name for job in jobs] == ["job1", "job2"]
+    assert jobs[0].ref_file == reference_file
+    assert jobs[0].query_files == query_files
+    assert jobs[1].query_files == []
+
+
+def test_load_invalid_batch_manifest(reference_file: Path, tmp_path: Path):
+    """Test load invalid batch manifest error"""
+    manifest_file = tmp_path / "manifest.tsv"
+    manifest_file.write_text(
+        f"job1\t{reference_file}\tnoexist.faa,query.txt,a/query.faa,b/query.gbk\n"
+        + f"job1\t{reference_file}\n"
+        + "job2\n"
+    )
+    with pytest.raises(ValueError) as e:
+        load_batch_manifest(manifest_file)
+
+    assert "File not found" in str(e.value)
+    assert "invalid file suffix" in str(e.value)
+    assert "Duplicated name 'job1'" in str(e.value)
+    assert "Invalid format 'job2'" in str(e.value)
+    assert "Duplicated query file names" in str(e.value)
+
+
+@pytest.mark.parametrize(
+    "name", ["../job", "/tmp/job", "a/b", "a\\b", "..", "panel_rbh"]
+)
+def test_load_invalid_name_batch_manifest(
+    reference_file: Path, tmp_path: Path, name: str
+):
+    """Test load batch manifest with unsafe job name (Not single path component)"""
+    manifest_file = tmp_path / "manifest.tsv"
+    manifest_file.write_text(f"{name}\t{reference_file}\n")
+    with pytest.raises(ValueError) as e:
+        load_batch_manifest(manifest_file)
+
+    assert f"Invalid name '{name}'" in str(e.value)
@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+
+from mgcplotter.cache import ResultCache, SharedCache
+
+
+def test_result_cache(tmp_path: Path):
+    """Test result cache is valid only for same input contents & parameters"""
+    input_file, result_file = tmp_path / "input.txt", tmp_path / "result.txt"
+    input_file.write_text("input")
+    cache = ResultCache(tmp_path / "cache_manifest.json")
+    key = cache.make_key(input_file, 1e-3)
+    assert not cache.is_valid(result_file, key)
+
+    result_file.write_text("result")
+    assert not cache.is_valid(result_file, key)
+    cache.update(result_file, key)
+    assert cache.is_valid(result_file, key)
+    assert not cache.is_valid(result_file, cache.make_key(input_file, 1e-5))
+
+    # Reload manifest & change input file contents
+    cache = ResultCache(tmp_path / "cache_manifest.json")
+    assert cache.is_valid(result_file, cache.make_key(input_file, 1e-3))
+    input_file.write_text("changed input")
+    assert not cache.is_valid(result_file, cache.make_key(input_file, 1e-3))
+
+
+def test_shared_cache(tmp_path: Path):
+    """Test shared cache restores results across output directories"""
+    shared_cache = SharedCache(tmp_path / "shared_cache")
+    outdir1, outdir2 = tmp_path / "outdir1", tmp_path / "outdir2"
+    input_file = tmp_path / "input.txt"
+    input_file.write_text("input")
+
+    cache1 = ResultCache(outdir1 / "cache_manifest.json", shared_cache)
+    key = cache1.make_key(input_file)
+    outdir1.mkdir()
+    (outdir1 / "result.txt").write_text("result")
+    cache1.update(outdir1 / "result.txt", key)
+
+    outdir2.mkdir()
+    cache2 = ResultCache(outdir2 / "cache_manifest.json", shared_cache)
+    assert cache2.load(outdir2 / "result.txt", key)
+    assert (outdir2 / "result.txt").read_text() == "result"
+    assert cache2.is_valid(outdir2 / "result.txt", key)
+    assert not cache2.load(outdir2 / "other.txt", cache2.make_key("other"))
+
+
+def test_shared_cache_lru_eviction(tmp_path: Path):
+    """Test least recently used files are evicted over max size"""
+    shared_cache = SharedCache(tmp_path / "shared_cache", max_size=250)
+    result_file = tmp_path / "result.txt"
+    result_file.write_text("x" * 100)
+    for i, key in enumerate(("key1", "key2")):
+        shared_cache.save(key, result_file)
+        cache_file = shared_cache._cache_file(key, ".txt")
+        os.utime(cache_file, ns=(i * 10**9, i * 10**9))
+    # 'key1' is used more recently than 'key2'
+    assert shared_cache.load("key1", tmp_path / "loaded.txt")
+
+    shared_cache.save("key3", result_file)
+    assert shared_cache.load("key1", tmp_path / "loaded.txt")
+    assert not shared_cache.load("key2", tmp_path / "loaded.txt")
+    assert shared_cache.load("key3", tmp_path / "loaded.txt")
@@ -0,0 +1,181 @@
+import math
+from pathlib import Path
+from typing import Optional
+
+import matplotlib as mpl
+import numpy as np
+import pytest
+
+from mgcplotter.circos_config import (
+    CircosConfig,
+    load_rbh_cds_identities,
+    merge_narrow_spans,
+)
+from mgcplotter.genbank import Genbank
+
+
+@pytest.mark.parametrize("hexcolor,vmin", [("d2691e", 0.0), ("#dc143c", 0.3)])
+def test_get_interpolated_colors(hexcolor: str, vmin: float):
+    """Test bulk interpolated colors are identical to per value interpolation"""
+    values = list(np.random.default_rng(0).random(500))
+    values += [i / 256 for i in range(257)] + [0.0, 1.0, -0.1, 1.2]
+
+    cmap = mpl.colors.LinearSegmentedColormap.from_list(
+        "cmap", ("white", f"#{hexcolor.lstrip('#')}")
+    )
+    norm = mpl.colors.Normalize(vmin=vmin, vmax=1.0)
+    expected = [mpl.colors.to_hex(cmap(norm(v))).lstrip("#") for v in values]
+
+    colors = CircosConfig._get_interpolated_colors(None, hexcolor, values, vmin)
+    assert colors == expected
+
+
+def test_write_cds_file_with_cds_colors(reference_file: Path, tmp_path: Path):
+    """Test CDS track is written with assigned CDS index color"""
+    ref_gbk = Genbank(reference_file)
+    table = ref_gbk.feature_table
+    cds_num = len(table.search("CDS"))
+    cds_colors = ["#B8B8B8"] * cds_num
+    # First forward CDS index
+    cds_idx = int(np.flatnonzero(table.strands[table.search("CDS")] == 1)[0])
+    cds_colors[cds_idx] = "#FF0000"
+    circos_config = CircosConfig(ref_gbk, tmp_path, cds_colors=cds_colors)
+    circos_config.write_config_file()
+
+    row_idx = table.search("CDS")[cds_idx]
+    location = f"{table.starts[row_idx]} {table.ends[row_idx]} +"
+    lines = circos_config.f_cds_file.read_text().splitlines()
+    reverse_lines = circos_config.r_cds_file.read_text().splitlines()
+    assert len(lines) + len(reverse_lines) == cds_num
+    assert lines[0] == f"main {location} color=ff0000"
+    assert all(line.endswith(" color=b8b8b8") for line in lines[1:] + reverse_lines)
+
+
+def test_load_rbh_cds_identities(tmp_path: Path):
+    """Test RBH result CDS indices are unique & sorted numerically"""
+    rbh_result_file = tmp_path / "rbh.tsv"
+    targets = [
+        "GENE000010_WP_1.1|900_1000_+|",
+        "GENE000002|100_200_-|",
+        "GENE1000000|5_9_+|",
+        "GENE000002|100_200_-|",
+    ]
+    rows = [
+        f"Q{i}\t{t}\t0.{i + 5}\t1\t1\t1\t1\t1\t1\t1\t1E-5\t50"
+        for i, t in enumerate(targets)
+    ]
+    rbh_result_file.write_text("\n".join(rows) + "\n")
+    cds_idxs, fidents = load_rbh_cds_identities(rbh_result_file)
+    assert cds_idxs.tolist() == [1, 9, 999999]
+    assert fidents.tolist() == [0.6, 0.5, 0.7]
+
+    empty_rbh_result_file = tmp_path / "empty_rbh.tsv"
+    empty_rbh_result_file.write_text("")
+    cds_idxs, fidents = load_rbh_cds_identities(empty_rbh_result_file)
+    assert len(cds_idxs) == len(fidents) == 0
+
+
+def test_load_rbh_cds_identities_pyarrow_parity(tmp_path: Path, monkeypatch):
+    """Test pyarrow CSV reader & pandas fallback load same RBH result"""
+    pytest.importorskip("pyarrow")
+    from mgcplotter import circos_config
+
+    rbh_result_file = tmp_path / "rbh.tsv"
+    rows = [
+        f"Q{i}\tGENE{(i * 7) % 50:06d}|{i}_{i + 99}_+|\t{fident}\t100\t1\t0"
+        + "\t1\t100\t1\t100\t1.000E-50\t500"
+        for i, fident in enumerate(["0.512", "1.000", "0.3", "9.5E-01"] * 20)
+    ]
+    rbh_result_file.write_text("\n".join(rows) + "\n")
+    assert circos_config.pa_csv is not None
+    pa_cds_idxs, pa_fidents = load_rbh_cds_identities(rbh_result_file)
+    monkeypatch.setattr(circos_config, "pa_csv", None)
+    pd_cds_idxs, pd_fidents = load_rbh_cds_identities(rbh_result_file)
+
+    assert len(pa_cds_idxs) == 50
+    assert pa_cds_idxs.dtype == pd_cds_idxs.dtype == np.int64
+    assert pa_fidents.dtype == pd_fidents.dtype == np.float64
+    assert np.array_equal(pa_cds_idxs, pd_cds_idxs)
+    assert np.array_equal(pa_fidents, pd_fidents)
+
+
+@pytest.mark.parametrize(
+    "gc_window_size,gc_step_size,expected_step_size",
+    [(None, None, None), (5000, None, 2000), (2000, 500, 500)],
+)
+def test_gc_window_size(
+    reference_file: Path,
+    tmp_path: Path,
+    gc_window_size: Optional[int],
+    gc_step_size: Optional[int],
+    expected_step_size: Optional[int],
+):
+    """Test GC content & GC skew track window/step size"""
+    ref_gbk = Genbank(reference_file)
+    circos_config = CircosConfig(
+        ref_gbk, tmp_path, gc_window_size=gc_window_size, gc_step_size=gc_step_size
+    )
+    if expected_step_size is None:
+        expected_step_size = int(int(ref_gbk.genome_length / 1000) * 0.4)
+    circos_config.write_config_file()
+
+    for gc_file in (circos_config.gc_content_file, circos_config.gc_skew_file):
+        lines = gc_file.read_text().splitlines()
+        assert len(lines) == math.ceil(ref_gbk.genome_length / expected_step_size)
+        assert lines[1].split(" ")[1] == str(expected_step_size)
+
+
+def test_gc_window_size_small_genome(reference_file: Path, tmp_path: Path):
+    """Test auto GC window size is not smaller than min window size"""
+    ref_gbk = Genbank(reference_file)
+    ref_gbk.__dict__["genome_length"] = 5000  # Small genome length (e.g. plasmid)
+    circos_config = CircosConfig(ref_gbk, tmp_path)
+    assert circos_config._window_size == CircosConfig.min_gc_window_size
+    assert circos_config._step_size == int(CircosConfig.min_gc_window_size * 0.4)
+
+
+def test_merge_narrow_spans():
+    """Test only adjacent narrow spans with same key & narrow gap are merged"""
+    starts = [0, 10, 20, 30, 100, 110, 200, 300, 310]
+    ends = [5, 15, 25, 35, 105, 190, 205, 305, 315]
+    keys = ["a", "a", "a", "b", "b", "b", "b", "b", "b"]
+    idxs, merged_starts, merged_ends = merge_narrow_spans(starts, ends, 10, keys)
+    assert idxs.tolist() == [0, 3, 4, 5, 6, 7]
+    assert merged_starts.tolist() == [0, 30, 100, 110, 200, 300]
+    assert merged_ends.tolist() == [25, 35, 105, 190, 205, 315]
+
+    idxs, _, merged_ends = merge_narrow_spans(starts, ends, 10)
+    assert idxs.tolist() == [0, 4, 5, 6, 7]
+    assert merged_ends.tolist() == [35, 105, 190, 205, 315]
+    assert len(merge_narrow_spans([], [], 10)[0]) == 0
+
+
+def test_merge_narrow_spans_unsorted():
+    """Test unsorted spans are merged only with adjacent spans in start order"""
+    starts, ends = [5000, 1200, 1300], [5050, 1250, 1350]
+    idxs, merged_starts, merged_ends = merge_narrow_spans(starts, ends, 135, ["a"] * 3)
+    assert idxs.tolist() == [1, 0]
+    assert merged_starts.tolist() == [1200, 5000]
+    assert merged_ends.tolist() == [1350, 5050]
+
+
+def test_lod_feature_merge(reference_file: Path, tmp_path: Path):
+    """Test sub-pixel features are merged unless full detail"""
+    ref_gbk = Genbank(reference_file)
+    full_config = CircosConfig(ref_gbk, tmp_path / "full", full_detail=True)
+    full_config.write_config_file()
+    lod_config = CircosConfig(ref_gbk, tmp_path / "lod", lod_pixel_width=20)
+    lod_config.write_config_file()
+
+    cds_num = len(ref_gbk.feature_table.search("CDS"))
+    full_lines = full_config.f_cds_file.read_text().splitlines()
+    full_lines += full_config.r_cds_file.read_text().splitlines()
+    assert len(full_lines) == cds_num
+    lod_lines = lod_config.f_cds_file.read_text().splitlines()
+    lod_lines += lod_config.r_cds_file.read_text().splitlines()
+    assert 0 < len(lod_lines) < cds_num
+    # Merged features cover all features
+    full_spans = sorted(tuple(map(int, line.split()[1:3])) for line in full_lines)
+    lod_spans = [tuple(map(int, line.split()[1:3])) for line in lod_lines]
+    for start, end in full_spans:
+        assert any(s <= start and end <= e for s, e in lod_spans)
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+
+from mgcplotter import circos_legend, config
+from mgcplotter.cache import SharedCache
+from mgcplotter.circos_config import CircosConfig
+from mgcplotter.circos_legend import CircosLegend
+from mgcplotter.genbank import Genbank
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_plot_all_legends(reference_file: Path, tmp_path: Path, processes: int):
+    """Test all legends are plotted as PNG & SVG"""
+    circos_config = CircosConfig(Genbank(reference_file), tmp_path / "circos")
+    legend_dir = tmp_path / "circos_legend"
+    CircosLegend(
+        circos_config,
+        config.cog_letter2color,
+        config.cog_letter2desc,
+        legend_dir,
+    ).plot_all_legends(processes=processes)
+
+    names = ["track_contents", "cog_letter", "cog_definition", "conserved_cds_identity"]
+    for name in names:
+        for suffix in (".png", ".svg"):
+            legend_file = legend_dir / f"{name}{suffix}"
+            assert legend_file.exists() and legend_file.stat().st_size > 0
+
+
+def test_plot_all_legends_cache(
+    reference_file: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test legends with same contents are copied from cache without rendering"""
+    circos_config = CircosConfig(Genbank(reference_file), tmp_path / "circos")
+    shared_cache = SharedCache(tmp_path / "cache")
+
+    def plot_all_legends(legend_dir: Path) -> None:
+        CircosLegend(
+            circos_config,
+            config.cog_letter2color,
+            config.cog_letter2desc,
+            legend_dir,
+            shared_cache=shared_cache,
+        ).plot_all_legends()
+
+    plot_all_legends(tmp_path / "legend1")
+
+    def plot_error(*args, **kwargs):
+        raise AssertionError("Cached legend is rendered")
+
+    monkeypatch.setattr(circos_legend, "plot_legend", plot_error)
+    monkeypatch.setattr(circos_legend, "plot_identity_colorbar", plot_error)
+    plot_all_legends(tmp_path / "legend2")
+    legend_files = sorted((tmp_path / "legend1").iterdir())
+    assert len(legend_files) == 8
+    for legend_file in legend_files:
+        cached_legend_file = tmp_path / "legend2" / legend_file.name
+        assert legend_file.read_bytes() == cached_legend_file.read_bytes()
+
+    # Changed legend contents is rendered
+    circos_config.conserved_cds_color = "ff0000"
+    with pytest.raises(AssertionError):
+        plot_all_legends(tmp_path / "legend3")
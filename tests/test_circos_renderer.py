@@ -0,0 +1,98 @@
+import math
+from pathlib import Path
+
+import matplotlib as mpl
+import matplotlib.image
+import numpy as np
+import pytest
+from matplotlib.collections import PolyCollection
+
+from mgcplotter.circos_config import CircosConfig
+from mgcplotter.circos_renderer import CircosRenderer, load_circos_conf
+from mgcplotter.genbank import Genbank
+
+# Circos image layout of MGCplotter config ('etc/image.conf', 'ideogram.conf')
+image_radius = 1500
+ideogram_inner_r = image_radius * 0.80 - 15
+
+
+@pytest.fixture(scope="module")
+def circos_config(reference_file: Path, tmp_path_factory) -> CircosConfig:
+    """Circos config (written) fixture of reference genome"""
+    outdir = tmp_path_factory.mktemp("circos")
+    circos_config = CircosConfig(Genbank(reference_file), outdir)
+    circos_config.write_config_file()
+    return circos_config
+
+
+def test_load_circos_conf(tmp_path: Path):
+    """Test Circos config blocks, includes & overrides are loaded"""
+    include_file = tmp_path / "include.conf"
+    include_file.write_text("<image>\ndir = .\nradius = 1000p # comment\n</image>\n")
+    conf_file = tmp_path / "circos.conf"
+    conf_file.write_text(
+        "karyotype = karyotype.txt\n"
+        + "<plots>\n<plot>\ntype = tile\n</plot>\n<plot>\ntype = histogram\n</plot>\n"
+        + "</plots>\n"
+        + f"<<include {include_file.name}>>\n"
+        + "<<include not_found.conf>>\n"
+    )
+    conf = load_circos_conf(conf_file)
+    assert conf["karyotype"] == "karyotype.txt"
+    assert [p["type"] for p in conf["plots"][0]["plot"]] == ["tile", "histogram"]
+    assert conf["image"][0] == {"dir": ".", "radius": "1000p"}
+
+    conf_file.write_text(f"<image>\ndir* = out\n<<include {include_file}>>\n</image>\n")
+    assert load_circos_conf(conf_file)["image"][0]["dir"] == "out"
+
+
+def test_track_layout(circos_config: CircosConfig):
+    """Test each track is drawn as one collection with Circos track radius"""
+    renderer = CircosRenderer(circos_config.config_file)
+    assert renderer.image_radius == image_radius
+    assert renderer.ideogram_inner_r == ideogram_inner_r
+    assert renderer.genome_length == circos_config.ref_gbk.genome_length
+
+    conf_lines = circos_config.config_file.read_text().splitlines()
+    r1_values = [float(line.split("=")[1][:-1]) for line in conf_lines if "r1 " in line]
+    assert len(r1_values) == len(renderer.plots)
+    for plot, r1_value in zip(renderer.plots, r1_values):
+        assert renderer._track_radius(plot)[1] == pytest.approx(
+            r1_value * ideogram_inner_r
+        )
+
+    fig = renderer.plot()
+    collections = fig.axes[0].collections
+    poly_collections = [c for c in collections if isinstance(c, PolyCollection)]
+    # All tracks + Ideogram bands & outline
+    assert len(poly_collections) == len(renderer.plots) + 2
+    feature_files = (circos_config.f_cds_file, circos_config.r_cds_file)
+    for collection, feature_file in zip(poly_collections, feature_files):
+        line_num = len(feature_file.read_text().splitlines())
+        assert len(collection.get_paths()) == line_num
+
+
+@pytest.mark.parametrize("strand,color", [(1, "red"), (-1, "blue")])
+def test_render_tile_position(circos_config: CircosConfig, strand: int, color: str):
+    """Test CDS tile is rendered at Circos layout position with its color"""
+    outfiles = CircosRenderer(circos_config.config_file).render()
+    assert outfiles == [
+        circos_config.outdir / "circos.png",
+        circos_config.outdir / "circos.svg",
+    ]
+    image = matplotlib.image.imread(outfiles[0])
+    assert image.shape[:2] == (image_radius * 2, image_radius * 2)
+
+    # Longest CDS of target strand
+    table = circos_config.ref_gbk.feature_table
+    idxs = table.search("CDS", strand)
+    idx = idxs[np.argmax(table.ends[idxs] - table.starts[idxs])]
+    position = (table.starts[idx] + table.ends[idx]) / 2
+    genome_length = circos_config.ref_gbk.genome_length
+    theta = math.radians(-90 + 360 * position / (genome_length * 1.005))
+    # Tile in forward CDS track (1.000r - 0.930r) or reverse CDS track (- 0.860r)
+    track_r0 = 0.930 if strand == 1 else 0.860
+    r = ideogram_inner_r * track_r0 + 70 / 2
+    x = int(image_radius + r * math.cos(theta))
+    y = int(image_radius + r * math.sin(theta))
+    assert image[y, x, :3] == pytest.approx(mpl.colors.to_rgb(color), abs=0.02)
@@ -0,0 +1,135 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+from Bio import SeqIO
+
+from mgcplotter.genbank import Genbank
+
+
+def naive_gc_content(seq: str, window_size: int, step_size: int) -> List[float]:
+    """Naive sliding window GC content for comparison"""
+    values = []
+    for i in range(0, len(seq), step_size):
+        start = max(i - int(window_size / 2), 0)
+        end = min(i + int(window_size / 2), len(seq))
+        subseq = seq[start:end]
+        gc = sum(subseq.count(b) for b in ("G", "C", "g", "c", "S", "s"))
+        values.append(gc * 100.0 / len(subseq) if len(subseq) != 0 else 0.0)
+    return values
+
+
+def naive_gc_skew(seq: str, window_size: int, step_size: int) -> List[float]:
+    """Naive sliding window GC skew for comparison"""
+    values = []
+    for i in range(0, len(seq), step_size):
+        start = max(i - int(window_size / 2), 0)
+        end = min(i + int(window_size / 2), len(seq))
+        subseq = seq[start:end]
+        g = subseq.count("G") + subseq.count("g")
+        c = subseq.count("C") + subseq.count("c")
+        values.append((g - c) / float(g + c) if g + c != 0 else 0.0)
+    return values
+
+
+@pytest.mark.parametrize("window_size,step_size", [(964, 385), (5000, 2000), (7, 3)])
+def test_gc_content_and_skew(reference_file: Path, window_size: int, step_size: int):
+    """Test GC content & GC skew are identical to naive sliding window result"""
+    gbk = Genbank(reference_file)
+    seq = gbk.genome_seq
+    gc_content = gbk.gc_content(window_size, step_size)
+    gc_skew = gbk.gc_skew(window_size, step_size)
+
+    assert gc_content == naive_gc_content(seq, window_size, step_size)
+    assert gc_skew == naive_gc_skew(seq, window_size, step_size)
+    assert gbk.average_gc == naive_gc_content(seq, len(seq) * 2, len(seq))[0]
+
+
+def test_clear_cache(reference_file: Path):
+    """Test cached sequence data is recomputed after clear_cache()"""
+    gbk = Genbank(reference_file)
+    genome_length = gbk.genome_length
+    assert gbk.contig_lengths == [genome_length]
+    assert gbk.contig_offsets == [0]
+
+    gbk._records.append(gbk._records[0])
+    assert gbk.genome_length == genome_length
+    gbk.clear_cache()
+    assert gbk.genome_length == genome_length * 2
+    assert gbk.contig_offsets == [0, genome_length]
+
+
+def test_feature_table_search(reference_file: Path):
+    """Test feature table search by feature type & strand"""
+    gbk = Genbank(reference_file)
+    table = gbk.feature_table
+    cds_idxs = table.search("CDS")
+    f_cds_idxs = table.search("CDS", 1)
+    r_cds_idxs = table.search("CDS", -1)
+
+    assert len(cds_idxs) == len(f_cds_idxs) + len(r_cds_idxs)
+    assert all(table.types[cds_idxs] == "CDS")
+    assert all(table.starts[cds_idxs] <= table.ends[cds_idxs])
+    assert all("translation" in table.qualifiers[i] for i in cds_idxs)
+    assert len(table.search("no_exist_type")) == 0
+    assert len(gbk.extract_all_features("CDS", 1)) == len(f_cds_idxs)
+
+
+def test_streaming_mode(reference_file: Path, tmp_path: Path):
+    """Test streaming mode loads same sequence & feature data"""
+    gbk = Genbank(reference_file)
+    streaming_gbk = Genbank(reference_file, streaming=True)
+    assert streaming_gbk._records == []
+    assert streaming_gbk.genome_seq == gbk.genome_seq
+
+    table, streaming_table = gbk.feature_table, streaming_gbk.feature_table
+    for name in ("types", "starts", "ends", "strands", "record_idxs"):
+        assert all(getattr(table, name) == getattr(streaming_table, name))
+
+    fasta_file, streaming_fasta_file = tmp_path / "cds.faa", tmp_path / "s_cds.faa"
+    gbk.write_cds_fasta(fasta_file)
+    streaming_gbk.write_cds_fasta(streaming_fasta_file)
+    assert fasta_file.read_text() == streaming_fasta_file.read_text()
+
+
+@pytest.mark.parametrize("dataset", ["reference", "query_gbff"])
+def test_fast_parser_parity(small_dataset_dir: Path, dataset: str):
+    """Test fast parser extracts same data as Biopython parser"""
+    for gbk_file in sorted((small_dataset_dir / dataset).glob("*.gbff")):
+        gbk = Genbank(gbk_file, streaming=True)
+        fast_gbk = Genbank(gbk_file, fast_parser=True)
+        assert fast_gbk.parser_name == "fast"
+        assert fast_gbk.contig_seqs == gbk.contig_seqs
+
+        table, fast_table = gbk.feature_table, fast_gbk.feature_table
+        for name in ("types", "starts", "ends", "strands", "record_idxs"):
+            assert all(getattr(table, name) == getattr(fast_table, name))
+        assert fast_table.qualifiers == table.qualifiers
+
+
+def test_fast_parser_fallback(reference_file: Path, tmp_path: Path):
+    """Test fast parser falls back to Biopython parser for unsupported location"""
+    contents = reference_file.read_text()
+    gene_line = next(line for line in contents.splitlines() if "gene   " in line)
+    between_gene_line = gene_line.split("gene")[0] + "gene            100^101"
+    gbk_file = tmp_path / "between_location.gbff"
+    gbk_file.write_text(contents.replace(gene_line, between_gene_line, 1))
+
+    fast_gbk = Genbank(gbk_file, fast_parser=True)
+    gbk = Genbank(gbk_file, streaming=True)
+    assert fast_gbk.parser_name == "biopython"
+    assert fast_gbk.genome_seq == gbk.genome_seq
+    assert len(fast_gbk.feature_table) == len(gbk.feature_table)
+
+
+def test_parse_cds_idxs(reference_file: Path, tmp_path: Path):
+    """Test CDS indices parsed from CDS fasta match feature table CDS order"""
+    gbk = Genbank(reference_file)
+    fasta_file = tmp_path / "cds.faa"
+    gbk.write_cds_fasta(fasta_file)
+    seq_ids = [rec.id for rec in SeqIO.parse(fasta_file, "fasta")]
+    cds_idxs = Genbank.parse_cds_idxs(seq_ids)
+    assert list(cds_idxs) == list(range(len(gbk.feature_table.search("CDS"))))
+
+    seq_ids = ["GENE000010|1_100_+|", "GENE1234567_WP_1.1|5_9_-|"]
+    assert list(Genbank.parse_cds_idxs(seq_ids)) == [9, 1234566]
@@ -1,5 +1,7 @@
 import os
 import subprocess as sp
+import sys
+import time
 from pathlib import Path
 
 
@@ -74,6 +76,22 @@ def test_invalid_suffix_error(reference_file: Path, tmp_path: Path):
     assert b"is invalid file suffix" in res.stderr
 
 
+def test_duplicated_query_name_error(
+    reference_file: Path, query_gbff_dir: Path, tmp_path: Path
+):
+    """Test duplicated query file names error (Same name in different directory)"""
+    query_file = sorted(query_gbff_dir.glob("*.gbff"))[0]
+    (tmp_path / "other").mkdir()
+    other_query_file = tmp_path / "other" / query_file.with_suffix(".faa").name
+    other_query_file.write_text(">dummy\nMKL\n")
+    cmd = f"MGCplotter -r {reference_file} -o {tmp_path / 'out'} "
+    cmd += f"--query_files {query_file} {other_query_file}"
+    res = sp.run(cmd, shell=True, capture_output=True)
+
+    assert res.returncode != 0
+    assert b"Duplicated file names" in res.stderr
+
+
 def test_invalid_color_like_string_error(reference_file: Path, tmp_path: Path):
     """Test invalid color like string error"""
     cmd = f"MGCplotter -r {reference_file} -o {tmp_path} --rrna_color invalidcolor"
@@ -92,6 +110,133 @@ def test_invalid_radius_value_range_error(reference_file: Path, tmp_path: Path):
     assert b"is invalid value range" in res.stderr
 
 
+def test_batch_run(
+    reference_file: Path,
+    query_gbff_dir: Path,
+    tmp_path: Path,
+    use_thread_num: int,
+):
+    """Test batch run"""
+    query_files = ",".join(map(str, query_gbff_dir.glob("*.gbff")))
+    manifest_file = tmp_path / "manifest.tsv"
+    manifest_file.write_text(
+        f"job1\t{reference_file}\t{query_files}\njob2\t{reference_file}\n"
+    )
+    outdir = tmp_path / "outdir"
+    cmd = (
+        f"MGCplotter --batch_manifest {manifest_file} -o {outdir} "
+        + f"--thread_num {use_thread_num} --batch_job_num 2"
+    )
+    res = sp.run(cmd, shell=True, capture_output=True)
+
+    assert res.returncode == 0
+    assert (outdir / "job1" / "circos.png").exists()
+    assert (outdir / "job2" / "circos.png").exists()
+
+
+def test_batch_run_assign_cog_color(
+    reference_file: Path,
+    query_faa_dir: Path,
+    tmp_path: Path,
+    use_thread_num: int,
+):
+    """Test batch run with COG color assignment (Concurrent batch workers)"""
+    query_files = ",".join(map(str, query_faa_dir.glob("*.faa")))
+    manifest_file = tmp_path / "manifest.tsv"
+    manifest_file.write_text(
+        f"job1\t{reference_file}\t{query_files}\njob2\t{reference_file}\n"
+    )
+    outdir = tmp_path / "outdir"
+    cmd = (
+        f"MGCplotter --batch_manifest {manifest_file} -o {outdir} "
+        + f"--thread_num {use_thread_num} --batch_job_num 2 --assign_cog_color"
+    )
+    res = sp.run(cmd, shell=True, capture_output=True)
+
+    assert res.returncode == 0
+    cog_results = []
+    for name in ("job1", "job2"):
+        assert (outdir / name / "circos.png").exists()
+        cog_result_file = outdir / name / "cogclassifier" / "classifier_result.tsv"
+        cog_results.append(cog_result_file.read_text())
+    assert cog_results[0] == cog_results[1]
+
+
+def test_run_reuse_rbh_results(
+    reference_file: Path, query_faa_dir: Path, tmp_path: Path, monkeypatch
+):
+    """Test forced run reuses cached RBH results (e.g. derived from panel)"""
+    from mgcplotter import mgcplotter
+    from mgcplotter.cache import ResultCache
+    from mgcplotter.genbank import Genbank
+
+    query_file = sorted(query_faa_dir.glob("*.faa"))[0]
+    rbh_dir = tmp_path / "rbh_search"
+    rbh_dir.mkdir()
+    # Pre-derived query CDS fasta & RBH result (like `run_panel()`)
+    cache = ResultCache(tmp_path / "cache_manifest.json")
+    query_faa_file = rbh_dir / query_file.name
+    query_faa_file.write_text(query_file.read_text())
+    cache.update(query_faa_file, cache.make_key(query_file, mgcplotter.__version__))
+    ref_faa_file = tmp_path / "reference_cds.faa"
+    Genbank(reference_file, fast_parser=True).write_cds_fasta(ref_faa_file)
+    rbh_result_file = rbh_dir / f"{query_file.stem}_vs_reference_rbh.tsv"
+    rbh_result_file.write_text("")
+    rbh_key = mgcplotter.get_rbh_cache_key(cache, query_faa_file, ref_faa_file, 1e-3)
+    cache.update(rbh_result_file, rbh_key)
+
+    search_query_files_list = []
+    monkeypatch.setattr(
+        mgcplotter,
+        "run_mmseqs_rbh_searches",
+        lambda query_files, *args, **kwargs: search_query_files_list.append(
+            query_files
+        ),
+    )
+    for reuse_rbh_results, search_num in ((True, 0), (False, 1)):
+        mgcplotter.run(
+            ref_file=reference_file,
+            outdir=tmp_path,
+            query_files=[query_file],
+            cog_evalue=1e-2,
+            mmseqs_evalue=1e-3,
+            thread_num=1,
+            force=True,
+            skip_circos=True,
+            reuse_rbh_results=reuse_rbh_results,
+        )
+        assert len(search_query_files_list[-1]) == search_num
+
+
+def test_invalid_panel_files_error(reference_file: Path, tmp_path: Path):
+    """Test invalid panel files error"""
+    cmd = f"MGCplotter --panel_files {reference_file} -o {tmp_path}"
+    res = sp.run(cmd, shell=True, capture_output=True)
+
+    assert res.returncode != 0
+    assert b"At least 2 genome files are required" in res.stderr
+
+
+def test_reserved_panel_file_name_error(reference_file: Path, tmp_path: Path):
+    """Test reserved panel file name error (Output collides with shared directory)"""
+    panel_file = tmp_path / "panel_rbh.gbff"
+    panel_file.write_text(reference_file.read_text())
+    cmd = f"MGCplotter --panel_files {reference_file} {panel_file} -o {tmp_path}"
+    res = sp.run(cmd, shell=True, capture_output=True)
+
+    assert res.returncode != 0
+    assert b"'panel_rbh' is reserved file name" in res.stderr
+
+
+def test_invalid_job_num_error(reference_file: Path, tmp_path: Path):
+    """Test invalid job number error"""
+    cmd = f"MGCplotter -r {reference_file} -o {tmp_path} --job_num 0"
+    res = sp.run(cmd, shell=True, capture_output=True)
+
+    assert res.returncode != 0
+    assert b"is invalid value" in res.stderr
+
+
 def test_cog_color_file_not_found_error(reference_file: Path, tmp_path: Path):
     """Test cog color file not found error"""
     cmd = f"MGCplotter -r {reference_file} -o {tmp_path} --cog_color_json noexist.json"
@@ -126,3 +271,22 @@ def test_generate_cog_color_template(tmp_path: Path):
     cog_color_template_json_file = Path(os.getcwd()) / "cog_color_template.json"
     assert cog_color_template_json_file.exists()
     assert res.returncode == 0
+
+
+def test_version_startup_time():
+    """Test '--version' runs fast without loading heavy dependencies"""
+    time_budget = 2.0
+    start_time = time.perf_counter()
+    res = sp.run("MGCplotter --version", shell=True, capture_output=True)
+    elapsed_time = time.perf_counter() - start_time
+    assert res.returncode == 0
+    assert elapsed_time < time_budget
+
+    code = (
+        "import sys, mgcplotter.mgcplotter; "
+        + "print(','.join(sorted(m for m in "
+        + "('matplotlib', 'pandas', 'Bio', 'cogclassifier') if m in sys.modules)))"
+    )
+    res = sp.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert res.returncode == 0
+    assert res.stdout.strip() == ""
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from mgcplotter.panel import PanelRbhTable
+
+
+def test_panel_rbh_table(tmp_path: Path):
+    """Test panel RBH table derives both direction RBH results"""
+    rbh_result_file = tmp_path / "A_vs_B_rbh.tsv"
+    rbh_result_file.write_text(
+        "a1|1_90_+|\tb1|11_100_-|\t0.500\t30\t15\t0\t1\t30\t2\t31\t1.0e-10\t50\n"
+        + "a2|100_400_+|\tb2|201_500_+|\t1.000\t100\t0\t0\t1\t100\t1\t100\t1e-50\t200\n"
+    )
+    empty_rbh_result_file = tmp_path / "A_vs_C_rbh.tsv"
+    empty_rbh_result_file.write_text("")
+    table = PanelRbhTable.from_rbh_result_files(
+        {("A", "B"): rbh_result_file, ("A", "C"): empty_rbh_result_file}
+    )
+    table_file = tmp_path / "panel_rbh_table.tsv"
+    table.write(table_file)
+    table = PanelRbhTable.load(table_file)
+
+    # Same as original RBH result
+    forward_file = tmp_path / "forward.tsv"
+    table.write_rbh_result("A", "B", forward_file)
+    assert forward_file.read_text() == rbh_result_file.read_text()
+
+    # Query & target columns are swapped
+    reverse_df = table.get_rbh_result("B", "A")
+    assert list(reverse_df["QUERY"]) == ["b1|11_100_-|", "b2|201_500_+|"]
+    assert list(reverse_df["TARGET"]) == ["a1|1_90_+|", "a2|100_400_+|"]
+    assert list(reverse_df["QSTART"]) == ["2", "1"]
+    assert list(reverse_df["TSTART"]) == ["1", "1"]
+    assert list(reverse_df["EVALUE"]) == ["1.0e-10", "1e-50"]
+    assert len(table.get_rbh_result("C", "A")) == 0
+
+
+def test_panel_rbh_table_pairs(tmp_path: Path):
+    """Test panel RBH table derives RBH result of each ordered genome pair"""
+    names = ["A", "B", "C"]
+    pair2rbh_result_file = {}
+    for name_a, name_b in [("A", "B"), ("A", "C"), ("B", "C")]:
+        rbh_result_file = tmp_path / f"{name_a}_vs_{name_b}_rbh.tsv"
+        rbh_result_file.write_text(
+            f"{name_a}1\t{name_b}1\t0.500\t30\t15\t0\t1\t30\t2\t31\t1.0e-10\t50\n"
+        )
+        pair2rbh_result_file[(name_a, name_b)] = rbh_result_file
+    table = PanelRbhTable.from_rbh_result_files(pair2rbh_result_file)
+    for query_name in names:
+        for ref_name in names:
+            if query_name == ref_name:
+                continue
+            rbh_df = table.get_rbh_result(query_name, ref_name)
+            assert list(rbh_df["QUERY"]) == [f"{query_name}1"]
+            assert list(rbh_df["TARGET"]) == [f"{ref_name}1"]
+    assert len(table.get_rbh_result("A", "D")) == 0
@@ -0,0 +1,130 @@
+import json
+import os
+import platform
+import resource
+import subprocess as sp
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from mgcplotter.profiler import PeakRssMonitor, StageProfiler, run_command
+
+
+def test_stage_profiler(tmp_path: Path):
+    """Test stage profile report (including child process CPU time)"""
+    profiler = StageProfiler(tmp_path)
+    with profiler.stage("python"):
+        sum(i * i for i in range(100000))
+    with profiler.stage("subprocess"):
+        sp.run("sleep 0.1", shell=True)
+    profiler.wrap("wrapped", lambda x: x)(1)
+    profiler.write_report()
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    stages = report["stages"]
+    assert [stage["name"] for stage in stages] == ["python", "subprocess", "wrapped"]
+    assert stages[1]["wall_time"] >= 0.1
+    assert all(stage["max_rss_mb"] > 0 for stage in stages)
+    assert all(stage["peak_rss_mb"] > 0 for stage in stages)
+    assert all(stage["tracemalloc_peak_mb"] is None for stage in stages)
+    assert list(tmp_path.glob("*.prof")) == []
+
+
+def test_stage_profiler_detail(tmp_path: Path):
+    """Test stage profile with cProfile stats & tracemalloc peak"""
+    profiler = StageProfiler(tmp_path, enabled=False, detail=True)
+    with profiler.stage("mmseqs_rbh:query"):
+        data = [0] * 1000000
+    del data
+    profiler.write_report()
+
+    stage = json.loads((tmp_path / "report.json").read_text())["stages"][0]
+    assert stage["tracemalloc_peak_mb"] > 7
+    assert (tmp_path / "mmseqs_rbh_query.prof").exists()
+
+
+def test_stage_profiler_disabled(tmp_path: Path):
+    """Test disabled profiler records & writes nothing"""
+    profiler = StageProfiler(tmp_path / "profile", enabled=False)
+    with profiler.stage("stage"):
+        pass
+    profiler.write_report()
+    assert profiler.records == []
+    assert not (tmp_path / "profile").exists()
+
+
+@pytest.mark.parametrize("interval", [0.05, 3600])
+def test_stage_profiler_peak_rss(tmp_path: Path, interval: float):
+    """Test peak RSS is measured per stage (Not process lifetime high-water mark)"""
+    profiler = StageProfiler(tmp_path)
+    profiler._rss_monitor.interval = interval
+    with profiler.stage("outer"):
+        with profiler.stage("large"):
+            data = b"x" * 200 * 1024**2
+            time.sleep(0.3)
+        del data
+        with profiler.stage("small"):
+            time.sleep(0.3)
+    large, small, outer = profiler.records
+    assert [r.name for r in (large, small, outer)] == ["large", "small", "outer"]
+    assert large.peak_rss_mb - small.peak_rss_mb > 150
+    assert outer.peak_rss_mb >= large.peak_rss_mb
+    assert large.rss_delta_mb > 150
+
+
+def test_stage_profiler_max_rss(tmp_path: Path):
+    """Test lifetime max RSS does not go down after large stage (Not reset)"""
+    profiler = StageProfiler(tmp_path)
+    with profiler.stage("large"):
+        data = b"x" * 200 * 1024**2
+    del data
+    with profiler.stage("small"):
+        pass
+    large, small = profiler.records
+    assert small.max_rss_mb >= large.max_rss_mb >= large.peak_rss_mb
+    assert small.peak_rss_mb < large.peak_rss_mb - 150
+    # Process max RSS of other callers is not affected
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    assert max_rss_mb >= large.peak_rss_mb - 1
+
+
+def test_peak_rss_monitor():
+    """Test peak RSS monitor returns peak not less than current RSS"""
+    monitor = PeakRssMonitor()
+    monitor_id = monitor.start()
+    rss_mb = monitor.rss_mb()
+    assert rss_mb > 0
+    assert monitor.stop(monitor_id) >= rss_mb
+
+
+def test_stage_profiler_children_peak_rss(tmp_path: Path):
+    """Test peak RSS of child process is recorded only to its own stage"""
+    profiler = StageProfiler(tmp_path)
+    alloc_cmd = f"{sys.executable} -c 'data = b\"x\" * 200 * 1024**2'"
+    with profiler.stage("large_child"):
+        assert run_command(alloc_cmd) == 0
+    with profiler.stage("small_child"):
+        assert run_command("exit 3") == 3
+    large, small = profiler.records
+    assert large.children_peak_rss_mb > 200
+    assert small.children_peak_rss_mb < 50
+    with pytest.raises(sp.CalledProcessError):
+        run_command("exit 1", check=True)
+
+
+def test_peak_rss_monitor_sampling_no_child(tmp_path: Path, monkeypatch):
+    """Test RSS sampling without procfs (e.g. macOS) does not run child process"""
+    exists = os.path.exists
+    monkeypatch.setattr(
+        os.path, "exists", lambda p: p != "/proc/self/status" and exists(p)
+    )
+    monkeypatch.setattr(platform, "system", lambda: "Darwin")
+    profiler = StageProfiler(tmp_path)
+    profiler._rss_monitor.interval = 0.01
+    with profiler.stage("sampling"):
+        time.sleep(0.3)
+    record = profiler.records[0]
+    assert record.children_cpu_time == 0
+    assert record.children_peak_rss_mb == 0